@@ -1,12 +1,13 @@
 import sys
 from pathlib import Path
-import requests
+sys.path.append(str(Path.cwd() / "scripts"))
+from http_session import shared_session
 
 token = Path.home().joinpath(".github_token").read_text().strip()
 headers = {"Authorization": f"token {token}"}
 
 print("Fetching latest release info...")
-response = requests.get(
+response = shared_session().get(
     "https://api.github.com/repos/Bin-Huang/chatbox/releases/latest",
     headers=headers
 )
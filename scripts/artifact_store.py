@@ -0,0 +1,104 @@
+from pathlib import Path
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from typing import BinaryIO, Dict, Optional, Tuple
+
+
+class ArtifactStore:
+    def __init__(self, root: Path, max_bytes: int = 10 * 1024 ** 3):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.blob_dir = root / "sha256"
+        self.tmp_dir = root / "tmp"
+        self.index_path = root / "index.json"
+        self._lock = threading.Lock()
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+        self.tmp_dir.mkdir(parents=True, exist_ok=True)
+        try:
+            self._index: Dict[str, Dict] = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self._index = {}
+
+    def blob_path(self, digest: str) -> Path:
+        return self.blob_dir / digest[:2] / digest
+
+    def lookup(self, url: str, validator: Tuple = ()) -> Optional[str]:
+        with self._lock:
+            entry = self._index.get(url)
+        if not entry or tuple(entry.get("validator", ())) != tuple(validator):
+            return None
+        try:
+            # mtime doubles as the LRU timestamp.
+            os.utime(self.blob_path(entry["sha256"]))
+        except OSError:
+            return None
+        return entry["sha256"]
+
+    def open_temp(self) -> BinaryIO:
+        return tempfile.NamedTemporaryFile(dir=self.tmp_dir, delete=False)
+
+    def commit(self, temp_path: Path, digest: str, url: str, validator: Tuple = ()) -> Path:
+        path = self.blob_path(digest)
+        path.parent.mkdir(exist_ok=True)
+        if path.exists():
+            os.unlink(temp_path)
+            os.utime(path)
+        else:
+            os.replace(temp_path, path)
+        with self._lock:
+            self._index[url] = {"sha256": digest, "validator": list(validator), "stored_at": time.time()}
+            self._save_index()
+        return path
+
+    def _save_index(self) -> None:
+        tmp_path = self.index_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self._index, indent=1), encoding="utf-8")
+        os.replace(tmp_path, self.index_path)
+
+    def evict(self) -> int:
+        with self._lock:
+            blobs = []
+            for path in self.blob_dir.glob("*/*"):
+                stat = path.stat()
+                blobs.append((stat.st_mtime, stat.st_size, path))
+            total = sum(size for _, size, _ in blobs)
+            removed = set()
+            for _, size, path in sorted(blobs):
+                if total <= self.max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                removed.add(path.name)
+                total -= size
+            if removed:
+                self._index = {url: entry for url, entry in self._index.items() if entry["sha256"] not in removed}
+                self._save_index()
+            for stale in self.tmp_dir.glob("*"):
+                if time.time() - stale.stat().st_mtime > 86400:
+                    stale.unlink(missing_ok=True)
+            return len(removed)
+
+    def seed_scoop_cache(self, cache_dir: Path, app: str, version: str, url: str) -> Optional[Path]:
+        with self._lock:
+            entry = self._index.get(url.split("#")[0])
+        if not entry:
+            return None
+        source = self.blob_path(entry["sha256"])
+        if not source.exists():
+            return None
+        # Matches Scoop's cache_path(): <app>#<version>#<first 7 of sha256(url)><extension>
+        url_hash = hashlib.sha256(url.encode("utf-8")).hexdigest()[:7]
+        extension = os.path.splitext(url)[1]
+        target = cache_dir / f"{app}#{version}#{url_hash}{extension}"
+        if target.exists():
+            return target
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        try:
+            os.link(source, target)
+        except OSError:
+            shutil.copyfile(source, target)
+        return target
@@ -0,0 +1,111 @@
+from pathlib import Path
+import argparse
+import contextlib
+import io
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+import yaml
+
+from github_standin import GitHubStandIn
+
+
+def _peak_rss_kb() -> Optional[int]:
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes on Linux.
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def _seed_bucket(repo_path: Path, apps: int) -> None:
+    (repo_path / "bucket").mkdir(parents=True, exist_ok=True)
+    (repo_path / "scripts").mkdir(parents=True, exist_ok=True)
+    config = {"apps": {
+        f"bench-owner/app{i:04d}": {"patterns": {"64bit": "windows_amd64.zip"}, "last_checked": None}
+        for i in range(apps)
+    }}
+    (repo_path / "scripts" / "tracked_apps.yml").write_text(yaml.dump(config))
+
+
+def run_worker(repo_path: Path, api_url: str, jobs: int, graphql: bool) -> Dict:
+    from treble_scoop_updater import TrebleScoopUpdater
+    from http_session import PooledSession
+
+    updater = TrebleScoopUpdater(repo_path, "benchmark", api_url=api_url, session=PooledSession())
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        updater.update_manifests(jobs=jobs, graphql=graphql, check_all=True, commit=False)
+    return {"wall_seconds": round(time.perf_counter() - start, 3), "peak_rss_kb": _peak_rss_kb()}
+
+
+def run_case(standin: GitHubStandIn, apps: int, jobs: int, graphql: bool, warm: bool) -> Dict:
+    with tempfile.TemporaryDirectory(prefix="treblescoop-bench-") as tmp:
+        repo_path = Path(tmp)
+        _seed_bucket(repo_path, apps)
+        command = [sys.executable, __file__, "--worker", "--repo-path", str(repo_path),
+                   "--api-url", standin.url, "--jobs", str(jobs)] + (["--graphql"] if graphql else [])
+        runs = []
+        for _ in range(2 if warm else 1):
+            standin.reset_stats()
+            # Each run is a fresh process so peak RSS is measured per run.
+            output = subprocess.run(command, capture_output=True, text=True, check=True).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            result.update(standin.stats)
+            runs.append(result)
+    result = {"apps": apps, "jobs": jobs, "graphql": graphql, "cold": runs[0]}
+    if warm:
+        result["warm"] = runs[1]
+    return result
+
+
+def _print_table(results: List[Dict]) -> None:
+    print(f"{'apps':>6} {'jobs':>5} {'run':>5} {'wall s':>9} {'requests':>9} {'MiB sent':>9} {'304s':>6} {'peak RSS MiB':>13}")
+    for result in results:
+        for run in ("cold", "warm"):
+            if run not in result:
+                continue
+            stats = result[run]
+            rss = f"{stats['peak_rss_kb'] / 1024:.1f}" if stats["peak_rss_kb"] else "n/a"
+            print(f"{result['apps']:>6} {result['jobs']:>5} {run:>5} {stats['wall_seconds']:>9.3f} "
+                  f"{stats['requests']:>9} {stats['bytes_sent'] / 1024 ** 2:>9.2f} {stats['not_modified']:>6} {rss:>13}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark update_manifests against a local GitHub stand-in")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000], help="synthetic bucket sizes")
+    parser.add_argument("--jobs", "-j", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds of latency added to each request")
+    parser.add_argument("--asset-size", type=int, default=256 * 1024, help="bytes per release asset")
+    parser.add_argument("--graphql", action="store_true")
+    parser.add_argument("--warm", action="store_true", help="also measure a second run with warm caches")
+    parser.add_argument("--json", type=Path, help="write the results to this file")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--repo-path", type=Path, help=argparse.SUPPRESS)
+    parser.add_argument("--api-url", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        print(json.dumps(run_worker(args.repo_path, args.api_url, args.jobs, args.graphql)))
+        return 0
+
+    standin = GitHubStandIn(latency=args.latency, asset_size=args.asset_size).start()
+    try:
+        results = [run_case(standin, size, args.jobs, args.graphql, args.warm) for size in args.sizes]
+    finally:
+        standin.stop()
+
+    _print_table(results)
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
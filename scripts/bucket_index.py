@@ -0,0 +1,149 @@
+from pathlib import Path
+import argparse
+import hashlib
+import json
+import sys
+from typing import Dict, List, Optional
+
+from manifest_io import write_if_changed
+
+INDEX_VERSION = 1
+
+
+def git_blob_id(data: bytes) -> str:
+    # Same id `git hash-object` gives, so a fresh checkout still matches entries whose mtime changed.
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+def checkver_source(manifest: Dict) -> Optional[str]:
+    checkver = manifest.get("checkver")
+    if checkver is None:
+        return None
+    if isinstance(checkver, str):
+        return manifest.get("homepage")
+    return checkver.get("github") or checkver.get("url") or manifest.get("homepage")
+
+
+def summarize(manifest: Dict) -> Dict:
+    entry = {"version": manifest.get("version"), "checkver": checkver_source(manifest)}
+    for key in ("url", "hash"):
+        if key in manifest:
+            entry[key] = manifest[key]
+    architectures = {
+        arch: {key: scope[key] for key in ("url", "hash") if key in scope}
+        for arch, scope in manifest.get("architecture", {}).items()
+    }
+    if architectures:
+        entry["architecture"] = architectures
+    return entry
+
+
+class BucketIndex:
+    def __init__(self, bucket_path: Path, index_path: Path):
+        self.bucket_path = bucket_path
+        self.index_path = index_path
+        try:
+            data = json.loads(index_path.read_text(encoding="utf-8"))
+            self._apps: Dict[str, Dict] = data["apps"] if data.get("version") == INDEX_VERSION else {}
+        except (OSError, ValueError, KeyError):
+            self._apps = {}
+
+    def get(self, app: str) -> Optional[Dict]:
+        return self._apps.get(app)
+
+    def apps(self) -> Dict[str, Dict]:
+        return dict(self._apps)
+
+    def outdated(self, latest: Dict[str, str]) -> List[str]:
+        return [app for app, version in latest.items()
+                if app not in self._apps or self._apps[app].get("version") != version]
+
+    def _index_file(self, path: Path, previous: Optional[Dict]) -> Optional[Dict]:
+        stat = path.stat()
+        if previous and previous.get("mtime_ns") == stat.st_mtime_ns and previous.get("size") == stat.st_size:
+            return previous
+        data = path.read_bytes()
+        blob = git_blob_id(data)
+        if previous and previous.get("blob") == blob:
+            return {**previous, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+        try:
+            manifest = json.loads(data.decode("utf-8-sig"))
+        except ValueError as e:
+            print(f"Skipping {path.name} in bucket index: {e}")
+            return None
+        entry = summarize(manifest)
+        entry.update(blob=blob, mtime_ns=stat.st_mtime_ns, size=stat.st_size,
+                     last_checked=(previous or {}).get("last_checked"))
+        return entry
+
+    def refresh(self, last_checked: Optional[Dict[str, Optional[str]]] = None) -> int:
+        reindexed = 0
+        apps = {}
+        for path in sorted(self.bucket_path.glob("*.json")):
+            previous = self._apps.get(path.stem)
+            entry = self._index_file(path, previous)
+            if entry is None:
+                continue
+            if entry is not previous and entry.get("blob") != (previous or {}).get("blob"):
+                reindexed += 1
+            apps[path.stem] = entry
+        self._apps = apps
+        for app, value in (last_checked or {}).items():
+            self.set_last_checked(app, value)
+        return reindexed
+
+    def update(self, app: str, manifest: Dict, path: Path) -> None:
+        # The caller just wrote this manifest, so index it from memory instead of re-parsing.
+        stat = path.stat()
+        self._apps[app] = {
+            **summarize(manifest),
+            "blob": git_blob_id(path.read_bytes()),
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "last_checked": (self._apps.get(app) or {}).get("last_checked")
+        }
+
+    def set_last_checked(self, app: str, value: Optional[str]) -> None:
+        if app in self._apps:
+            self._apps[app]["last_checked"] = value
+
+    def save(self) -> bool:
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        # One app per line keeps the file compact while still cheap to diff by eye.
+        lines = [f"{json.dumps(app)}:{json.dumps(entry, separators=(',', ':'), sort_keys=True)}"
+                 for app, entry in sorted(self._apps.items())]
+        text = f'{{"version":{INDEX_VERSION},"apps":{{\n' + ",\n".join(lines) + "\n}}\n"
+        return write_if_changed(self.index_path, text)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Build and query the bucket index")
+    parser.add_argument("apps", nargs="*", help="print index entries for these apps (default: all)")
+    parser.add_argument("--repo-path", type=Path, default=Path(__file__).resolve().parent.parent)
+    parser.add_argument("--rebuild", action="store_true", help="discard the existing index and re-parse every manifest")
+    args = parser.parse_args(argv)
+
+    from config_store import ConfigStore
+
+    index_path = args.repo_path / "scripts" / ".cache" / "bucket_index.json"
+    if args.rebuild and index_path.exists():
+        index_path.unlink()
+    index = BucketIndex(args.repo_path / "bucket", index_path)
+    config_path = args.repo_path / "scripts" / "tracked_apps.yml"
+    last_checked = None
+    if config_path.exists():
+        config = ConfigStore(config_path, args.repo_path / "scripts" / ".cache" / "tracked_apps.snapshot.json").load() or {}
+        last_checked = {name.split("/")[1]: info.get("last_checked") for name, info in (config.get("apps") or {}).items()}
+    reindexed = index.refresh(last_checked)
+    index.save()
+    print(f"Re-indexed {reindexed} manifests", file=sys.stderr)
+
+    entries = index.apps()
+    if args.apps:
+        entries = {app: entries.get(app) for app in args.apps}
+    print(json.dumps(entries, indent=2))
+    return 0 if all(entry is not None for entry in entries.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
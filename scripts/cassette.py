@@ -0,0 +1,159 @@
+from pathlib import Path
+import base64
+import hashlib
+import io
+import json
+import os
+import threading
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.response import HTTPResponse
+
+RECORD = "record"
+REPLAY = "replay"
+TEXT_TYPES = ("json", "text", "xml", "yaml", "javascript")
+MAX_TEXT_BYTES = 1024 * 1024
+MAX_INLINE_BYTES = 64 * 1024
+KEPT_HEADERS = ("content-type", "content-range", "accept-ranges", "etag", "last-modified", "location", "link",
+                "retry-after", "x-ratelimit-limit", "x-ratelimit-remaining", "x-ratelimit-reset", "x-ratelimit-used")
+
+
+class CassetteMiss(requests.ConnectionError):
+    pass
+
+
+def request_key(request: requests.PreparedRequest) -> str:
+    key = f"{request.method} {request.url}"
+    if request.headers.get("Range"):
+        key += f" range={request.headers['Range']}"
+    if request.body:
+        body = request.body if isinstance(request.body, bytes) else request.body.encode()
+        key += f" body={hashlib.sha256(body).hexdigest()[:16]}"
+    return key
+
+
+class Cassette:
+    def __init__(self, path: Path, mode: str, store_content: bool = False):
+        self.path = path
+        self.mode = mode
+        self.store_content = store_content
+        self.body_dir = path / "bodies"
+        self._lock = threading.Lock()
+        self._exchanges: Dict[str, Dict] = {}
+        exchanges_path = path / "exchanges.jsonl"
+        if mode == REPLAY:
+            with open(exchanges_path, encoding="utf-8") as f:
+                for line in f:
+                    exchange = json.loads(line)
+                    self._exchanges[exchange["key"]] = exchange
+
+    def mount(self, session: requests.Session) -> None:
+        adapter = CassetteAdapter(self, pool_connections=32, pool_maxsize=32)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+    def _encode_body(self, status: int, headers: Dict[str, str], body: bytes) -> Dict:
+        content_type = headers.get("content-type", "")
+        if len(body) <= MAX_TEXT_BYTES and any(kind in content_type for kind in TEXT_TYPES):
+            try:
+                return {"text": body.decode("utf-8")}
+            except UnicodeDecodeError:
+                pass
+        # Range responses are zip tails and directories, small enough to keep whole.
+        if len(body) <= MAX_INLINE_BYTES or status == 206:
+            return {"base64": base64.b64encode(body).decode("ascii")}
+        digest = hashlib.sha256(body).hexdigest()
+        if self.store_content:
+            blob = self.body_dir / digest
+            if not blob.exists():
+                self.body_dir.mkdir(parents=True, exist_ok=True)
+                tmp_path = blob.with_name(f".{digest}.{threading.get_ident()}.tmp")
+                tmp_path.write_bytes(body)
+                os.replace(tmp_path, blob)
+        return {"sha256": digest, "size": len(body)}
+
+    def _decode_body(self, exchange: Dict) -> bytes:
+        if "text" in exchange:
+            return exchange["text"].encode("utf-8")
+        if "base64" in exchange:
+            return base64.b64decode(exchange["base64"])
+        try:
+            return (self.body_dir / exchange["sha256"]).read_bytes()
+        except OSError:
+            raise CassetteMiss(f"Body of {exchange['key']} was recorded as a digest only")
+
+    def record(self, request: requests.PreparedRequest, status: int, headers: Dict[str, str], body: bytes) -> None:
+        kept = KEPT_HEADERS + (("content-length",) if request.method == "HEAD" else ())
+        exchange = {"key": request_key(request), "status": status,
+                    "headers": {name: value for name, value in headers.items() if name in kept}}
+        exchange.update(self._encode_body(status, exchange["headers"], body))
+        with self._lock:
+            self._exchanges[exchange["key"]] = exchange
+
+    def lookup(self, request: requests.PreparedRequest) -> Dict:
+        exchange = self._exchanges.get(request_key(request))
+        if exchange is None:
+            raise CassetteMiss(f"No recorded response for {request_key(request)}")
+        return exchange
+
+    def recorded_digest(self, url: str) -> Optional[str]:
+        # Follows recorded redirects, so callers can ask with the URL they requested.
+        if self.mode != REPLAY:
+            return None
+        for _ in range(10):
+            exchange = self._exchanges.get(f"GET {url}")
+            if exchange is None:
+                return None
+            if 300 <= exchange["status"] < 400 and "location" in exchange["headers"]:
+                url = requests.compat.urljoin(url, exchange["headers"]["location"])
+                continue
+            if exchange["status"] != 200:
+                return None
+            if "sha256" in exchange:
+                return exchange["sha256"]
+            return hashlib.sha256(self._decode_body(exchange)).hexdigest()
+        return None
+
+    def save(self) -> None:
+        if self.mode != RECORD:
+            return
+        self.path.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            lines = [json.dumps(self._exchanges[key], sort_keys=True) for key in sorted(self._exchanges)]
+        tmp_path = self.path / f".exchanges.jsonl.{os.getpid()}.tmp"
+        tmp_path.write_text("".join(line + "\n" for line in lines), encoding="utf-8")
+        os.replace(tmp_path, self.path / "exchanges.jsonl")
+
+
+class CassetteAdapter(HTTPAdapter):
+    def __init__(self, cassette: Cassette, **kwargs):
+        super().__init__(**kwargs)
+        self.cassette = cassette
+
+    def _build(self, request: requests.PreparedRequest, status: int, headers: Dict[str, str],
+               body: bytes) -> requests.Response:
+        if request.method != "HEAD":
+            headers = {**headers, "content-length": str(len(body))}
+        raw = HTTPResponse(body=io.BytesIO(body), headers=headers, status=status,
+                           preload_content=False, decode_content=False)
+        return self.build_response(request, raw)
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        if self.cassette.mode == REPLAY:
+            exchange = self.cassette.lookup(request)
+            return self._build(request, exchange["status"], exchange["headers"], self.cassette._decode_body(exchange))
+
+        # Record full responses: a 304 would leave nothing to replay when the cache is cold.
+        for name in ("If-None-Match", "If-Modified-Since"):
+            request.headers.pop(name, None)
+        resp = super().send(request, stream=True, timeout=timeout, verify=verify, cert=cert, proxies=proxies)
+        try:
+            body = resp.raw.read(decode_content=True)
+        finally:
+            resp.close()
+        headers = {name.lower(): value for name, value in resp.headers.items()
+                   if name.lower() not in ("content-encoding", "transfer-encoding")}
+        self.cassette.record(request, resp.status_code, headers, body)
+        return self._build(request, resp.status_code, headers, body)
@@ -0,0 +1,247 @@
+from pathlib import Path
+import argparse
+import copy
+import json
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+from http_cache import HttpCache
+from manifest_io import canonical_json, write_if_changed
+from treble_scoop_updater import TrebleScoopUpdater, _read_token
+
+GITHUB_REPO_URL = re.compile(r"https?://github\.com/(?P<owner>[^/]+)/(?P<repo>[^/#?]+)")
+DEFAULT_GITHUB_REGEX = r"/releases/tag/(?:v|V)?([\d.]+)"
+SHA256_PATTERN = re.compile(r"\b[0-9a-fA-F]{64}\b")
+# Only sha256 is read from published checksums; other algorithms' files are resolved by download.
+OTHER_ALGORITHM = re.compile(r"(?i)(md5|sha1|sha384|sha512)")
+
+
+def to_python_regex(pattern: str) -> str:
+    # Scoop manifests use .NET syntax for named groups: (?<name>...)
+    return re.sub(r"\(\?<(?![=!])", "(?P<", pattern)
+
+
+def version_variables(version: str, match: Optional[re.Match] = None) -> Dict[str, str]:
+    parts = re.split(r"[.\-+_]", version)
+    variables = {
+        "$version": version,
+        "$underscoreVersion": version.replace(".", "_"),
+        "$dashVersion": version.replace(".", "-"),
+        "$cleanVersion": version.replace(".", "").replace("-", ""),
+        "$majorVersion": parts[0] if len(parts) > 0 else "",
+        "$minorVersion": parts[1] if len(parts) > 1 else "",
+        "$patchVersion": parts[2] if len(parts) > 2 else "",
+        "$buildVersion": parts[3] if len(parts) > 3 else "",
+        "$preReleaseVersion": version.split("-", 1)[1] if "-" in version else "",
+    }
+    if match:
+        for name, value in match.groupdict().items():
+            if value is not None and name != "version":
+                variables[f"$match{name[0].upper()}{name[1:]}"] = value
+    return variables
+
+
+def substitute(value, variables: Dict[str, str]):
+    if isinstance(value, str):
+        for token in sorted(variables, key=len, reverse=True):
+            value = value.replace(token, variables[token])
+        return value
+    if isinstance(value, list):
+        return [substitute(item, variables) for item in value]
+    if isinstance(value, dict):
+        return {key: substitute(item, variables) for key, item in value.items()}
+    return value
+
+
+class CheckverEngine:
+    def __init__(self, updater: TrebleScoopUpdater):
+        self.updater = updater
+        self.session = updater.session
+        self.http_cache = updater.http_cache
+        self.index = updater.bucket_index
+
+    def _fetch_text(self, url: str) -> Optional[str]:
+        cached = self.http_cache.get(url)
+        resp = self.session.get(url, headers=HttpCache.conditional_headers(cached))
+        if resp.status_code == 304 and cached:
+            self.http_cache.touch(url)
+            return cached["body"]
+        if resp.status_code != 200:
+            print(f"Fetching {url} failed with status {resp.status_code}")
+            return None
+        self.http_cache.put(url, resp.headers.get("ETag"), resp.headers.get("Last-Modified"), resp.text)
+        return resp.text
+
+    def resolve(self, manifest: Dict) -> Tuple[Optional[str], Optional[re.Match], Optional[Dict]]:
+        checkver = manifest.get("checkver")
+        if checkver is None:
+            return None, None, None
+        if isinstance(checkver, str):
+            checkver = {"github": manifest.get("homepage")} if checkver == "github" else {"regex": checkver}
+        regex = checkver.get("regex") or checkver.get("re")
+
+        if "github" in checkver:
+            repo_match = GITHUB_REPO_URL.match(checkver["github"] or "")
+            if not repo_match:
+                raise ValueError(f"Unsupported github checkver: {checkver['github']}")
+            release = self.updater._get_latest_release(repo_match.group("owner"), repo_match.group("repo"))
+            if not release:
+                return None, None, None
+            tag_url = release.get("html_url") or (
+                f"https://github.com/{repo_match.group('owner')}/{repo_match.group('repo')}"
+                f"/releases/tag/{release['tag_name']}"
+            )
+            match = re.search(to_python_regex(regex or DEFAULT_GITHUB_REGEX), tag_url)
+            if not match:
+                return release["tag_name"].lstrip("vV"), None, release
+            return (match.groupdict().get("version") or match.group(1)), match, release
+
+        if "jsonpath" in checkver or "xpath" in checkver:
+            raise ValueError("jsonpath/xpath checkver is not supported")
+        url = checkver.get("url") or manifest.get("homepage")
+        if not regex or not url:
+            raise ValueError("checkver needs a regex and a url or homepage")
+        text = self._fetch_text(url)
+        if text is None:
+            return None, None, None
+        match = re.search(to_python_regex(regex), text)
+        if not match:
+            return None, None, None
+        return (match.groupdict().get("version") or match.group(1)), match, None
+
+    def _autoupdate_hash(self, spec, url: str, variables: Dict[str, str], release: Optional[Dict]) -> str:
+        if isinstance(spec, dict) and spec.get("url"):
+            base = url.split("#")[0]
+            hash_vars = {**variables, "$url": base, "$baseurl": base.rsplit("/", 1)[0],
+                         "$basename": base.rsplit("/", 1)[1]}
+            hash_url = substitute(spec["url"], hash_vars)
+            if OTHER_ALGORITHM.search(hash_url.rsplit("/", 1)[-1]):
+                print(f"Only sha256 checksums are supported, hashing {url} instead of reading {hash_url}")
+                return self.updater._resolve_hash(url, release)
+            text = self._fetch_text(hash_url)
+            if text:
+                basename = hash_vars["$basename"]
+                for line in text.splitlines():
+                    if basename not in line:
+                        continue
+                    found = SHA256_PATTERN.search(line)
+                    if found:
+                        return found.group(0).lower()
+                # A file holding nothing but one hash covers just this download; a list
+                # of other files' hashes must not lend this one somebody else's.
+                hashes = SHA256_PATTERN.findall(text)
+                if len(hashes) == 1 and not SHA256_PATTERN.sub("", text).strip():
+                    return hashes[0].lower()
+        return self.updater._resolve_hash(url, release)
+
+    def apply_autoupdate(self, manifest: Dict, version: str, match: Optional[re.Match],
+                         release: Optional[Dict]) -> Dict:
+        autoupdate = manifest.get("autoupdate")
+        updated = copy.deepcopy(manifest)
+        updated["version"] = version
+        if not autoupdate:
+            return updated
+        variables = version_variables(version, match)
+
+        def apply(target: Dict, template: Dict) -> None:
+            for key, value in template.items():
+                if key in ("architecture", "hash"):
+                    continue
+                target[key] = substitute(value, variables)
+            if "url" in template:
+                urls = target["url"] if isinstance(target["url"], list) else [target["url"]]
+                hashes = [self._autoupdate_hash(template.get("hash"), url, variables, release) for url in urls]
+                target["hash"] = hashes if isinstance(target["url"], list) else hashes[0]
+
+        apply(updated, autoupdate)
+        for arch, template in autoupdate.get("architecture", {}).items():
+            apply(updated.setdefault("architecture", {}).setdefault(arch, {}), template)
+        return updated
+
+    def check(self, path: Path, update: bool) -> Dict:
+        result = {"app": path.stem, "path": str(path)}
+        entry = self.index.get(path.stem)
+        if entry is not None and entry.get("checkver") is None:
+            # The index already knows there is nothing to check, so skip parsing the manifest.
+            result.update(current=entry.get("version"), status="skipped")
+            return result
+        try:
+            manifest = json.loads(path.read_text(encoding="utf-8"))
+        except ValueError as e:
+            result.update(status="error", error=f"Invalid JSON: {e}")
+            return result
+        result["current"] = manifest.get("version")
+        try:
+            latest, match, release = self.resolve(manifest)
+        except (ValueError, re.error, requests.RequestException) as e:
+            result.update(status="error", error=str(e))
+            return result
+        if latest is None:
+            result["status"] = "skipped" if "checkver" not in manifest else "not found"
+            return result
+        result["latest"] = latest
+        if latest == manifest.get("version"):
+            result["status"] = "up to date"
+            return result
+        result["status"] = "outdated"
+        if update and manifest.get("autoupdate"):
+            try:
+                updated = self.apply_autoupdate(manifest, latest, match, release)
+            except requests.RequestException as e:
+                result.update(status="error", error=f"Autoupdate failed: {e}")
+                return result
+            if write_if_changed(path, canonical_json(updated)):
+                self.index.update(path.stem, updated, path)
+                result["status"] = "updated"
+        return result
+
+    def run(self, paths: List[Path], update: bool = False, jobs: int = 8) -> List[Dict]:
+        self.index.refresh()
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(lambda path: self.check(path, update), paths))
+        self.index.save()
+        return results
+
+    def outdated(self, results: List[Dict]) -> List[str]:
+        return self.index.outdated({result["app"]: result["latest"] for result in results if result.get("latest")})
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Check bucket manifests for new versions and apply autoupdate")
+    parser.add_argument("apps", nargs="*", help="manifest names to check (default: the whole bucket)")
+    parser.add_argument("--repo-path", type=Path, default=Path(__file__).resolve().parent.parent)
+    parser.add_argument("--update", "-u", action="store_true", help="rewrite outdated manifests from their autoupdate block")
+    parser.add_argument("--jobs", "-j", type=int, default=8)
+    parser.add_argument("--api-url", default="https://api.github.com", help="GitHub API base URL")
+    parser.add_argument("--outdated", action="store_true", help="only list apps whose indexed version is behind the latest")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    updater = TrebleScoopUpdater(args.repo_path, _read_token(required=False), api_url=args.api_url)
+    bucket = args.repo_path / "bucket"
+    paths = [bucket / f"{app}.json" for app in args.apps] if args.apps else sorted(bucket.glob("*.json"))
+    engine = CheckverEngine(updater)
+    results = engine.run(paths, update=args.update, jobs=max(1, args.jobs))
+    if args.outdated:
+        behind = set(engine.outdated(results))
+        results = [result for result in results if result["app"] in behind or result["status"] == "error"]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for result in results:
+            line = f"{result['app']}: {result['status']}"
+            if result.get("latest") and result["latest"] != result.get("current"):
+                line += f" ({result.get('current')} -> {result['latest']})"
+            if result.get("error"):
+                line += f" - {result['error']}"
+            print(line)
+    return 1 if any(result["status"] == "error" for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+from pathlib import Path
+import json
+import os
+from typing import Dict, Optional
+
+import yaml
+
+from manifest_io import write_if_changed
+
+# libyaml bindings are several times faster than the pure-Python loader and dumper.
+YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+YamlDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+SNAPSHOT_VERSION = 2
+
+
+class ConfigStore:
+    def __init__(self, config_path: Path, snapshot_path: Optional[Path] = None):
+        self.config_path = config_path
+        self.snapshot_path = snapshot_path
+
+    def _signature(self) -> list:
+        stat = self.config_path.stat()
+        return [SNAPSHOT_VERSION, stat.st_mtime_ns, stat.st_size]
+
+    def _read_snapshot(self, signature: list) -> Optional[Dict]:
+        # JSON rather than pickle: scripts/.cache is restored from the CI cache,
+        # and loading a tampered pickle would run arbitrary code.
+        if not self.snapshot_path:
+            return None
+        try:
+            snapshot = json.loads(self.snapshot_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if not isinstance(snapshot, dict) or snapshot.get("signature") != signature:
+            return None
+        return snapshot.get("config")
+
+    def _write_snapshot(self, signature: list, config: Dict) -> None:
+        if not self.snapshot_path:
+            return
+        try:
+            text = json.dumps({"signature": signature, "config": config})
+        except (TypeError, ValueError):
+            # YAML values without a JSON form (e.g. dates) just go without a snapshot.
+            return
+        self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.snapshot_path.with_name(f".{self.snapshot_path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+
+    def load(self) -> Optional[Dict]:
+        signature = self._signature()
+        config = self._read_snapshot(signature)
+        if config is None:
+            config = yaml.load(self.config_path.read_text(), Loader=YamlLoader)
+            self._write_snapshot(signature, config)
+        return config
+
+    def save(self, config: Dict) -> bool:
+        changed = write_if_changed(self.config_path, yaml.dump(config, Dumper=YamlDumper))
+        self._write_snapshot(self._signature(), config)
+        return changed
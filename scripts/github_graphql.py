@@ -0,0 +1,77 @@
+import json
+import requests
+from typing import Callable, Dict, List, Optional
+
+RELEASE_FIELDS = """
+    licenseInfo { spdxId }
+    latestRelease {
+      tagName
+      publishedAt
+      description
+      url
+      releaseAssets(first: 100) {
+        nodes { name size updatedAt downloadUrl contentType digest }
+      }
+    }
+"""
+
+
+def _build_query(repos: List[str]) -> str:
+    parts = []
+    for i, repo_full_name in enumerate(repos):
+        owner, repo = repo_full_name.split("/")
+        parts.append(
+            f"  r{i}: repository(owner: {json.dumps(owner)}, name: {json.dumps(repo)}) {{{RELEASE_FIELDS}  }}"
+        )
+    return "query {\n" + "\n".join(parts) + "\n}"
+
+
+def _to_rest_release(node: Optional[Dict]) -> Optional[Dict]:
+    if not node:
+        return None
+    return {
+        "tag_name": node["tagName"],
+        "published_at": node["publishedAt"],
+        "body": node.get("description") or "",
+        "html_url": node.get("url"),
+        "assets": [
+            {
+                "name": asset["name"],
+                "size": asset["size"],
+                "updated_at": asset["updatedAt"],
+                "browser_download_url": asset["downloadUrl"],
+                "content_type": asset.get("contentType"),
+                "digest": asset.get("digest")
+            }
+            for asset in (node.get("releaseAssets") or {}).get("nodes", [])
+        ]
+    }
+
+
+def fetch_latest_releases(endpoint: str, headers: Dict[str, str], repos: List[str],
+                          batch_size: int = 50, session=requests,
+                          post: Optional[Callable[[Dict], requests.Response]] = None) -> Dict[str, Dict]:
+    # The updater passes its own post so batches share its rate limiting and metrics.
+    if post is None:
+        def post(body: Dict) -> requests.Response:
+            return session.post(endpoint, headers=headers, json=body)
+    results = {}
+    for start in range(0, len(repos), batch_size):
+        batch = repos[start:start + batch_size]
+        resp = post({"query": _build_query(batch)})
+        if resp.status_code != 200:
+            print(f"GraphQL batch failed with status {resp.status_code}")
+            continue
+        payload = resp.json()
+        for error in payload.get("errors", []):
+            print(f"GraphQL error: {error.get('message')}")
+        data = payload.get("data") or {}
+        for i, repo_full_name in enumerate(batch):
+            node = data.get(f"r{i}")
+            if node is None:
+                continue
+            results[repo_full_name] = {
+                "release": _to_rest_release(node.get("latestRelease")),
+                "license": (node.get("licenseInfo") or {}).get("spdxId")
+            }
+    return results
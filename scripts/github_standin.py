@@ -0,0 +1,233 @@
+import io
+import json
+import re
+import threading
+import time
+import zipfile
+from hashlib import sha256
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+REPO_PATH = re.compile(r"^/repos/(?P<owner>[^/]+)/(?P<repo>[^/?]+)(?P<rest>/releases(?:/latest)?)?(?:\?.*)?$")
+ASSET_PATH = re.compile(r"^/assets/(?P<owner>[^/]+)/(?P<repo>[^/]+)/(?P<name>[^/?]+)$")
+GRAPHQL_REPO = re.compile(r'(r\d+): repository\(owner: "([^"]+)", name: "([^"]+)"\)')
+
+
+def _build_zip(size: int) -> bytes:
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", compression=zipfile.ZIP_STORED) as archive:
+        archive.writestr("app/app.exe", bytes(i % 251 for i in range(max(size - 200, 0))))
+        archive.writestr("app/README.txt", "stand-in asset")
+    return buf.getvalue()
+
+
+# Local stand-in for the parts of the GitHub API and release CDN the updater uses.
+class GitHubStandIn:
+    def __init__(self, latency: float = 0.0, asset_size: int = 64 * 1024, version: str = "1.0.0",
+                 host: str = "127.0.0.1", port: int = 0):
+        self.latency = latency
+        self.version = version
+        self.asset = _build_zip(asset_size)
+        # Set to e.g. 403 or 405 to mimic CDNs that reject HEAD requests for assets.
+        self.head_status: Optional[int] = None
+        # Canned error responses served ahead of normal handling, see fail_next().
+        self.faults: List[Tuple[int, Dict[str, str]]] = []
+        # Seconds to stall halfway through a full asset body, to exercise read timeouts.
+        self.body_stall = 0.0
+        # Extra release files such as checksum lists, served at /files/<name>.
+        self.files: Dict[str, bytes] = {}
+        # Whether release assets carry GitHub's sha256 "digest" field.
+        self.asset_digests = False
+        self.stats = {"requests": 0, "bytes_sent": 0, "not_modified": 0, "asset_downloads": 0}
+        self._stats_lock = threading.Lock()
+        self.server = ThreadingHTTPServer((host, port), self._make_handler())
+        self.server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "GitHubStandIn":
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def reset_stats(self) -> None:
+        with self._stats_lock:
+            for key in self.stats:
+                self.stats[key] = 0
+
+    def fail_next(self, count: int, status: int = 503, headers: Optional[Dict[str, str]] = None) -> None:
+        with self._stats_lock:
+            self.faults.extend([(status, headers or {})] * count)
+
+    def _take_fault(self) -> Optional[Tuple[int, Dict[str, str]]]:
+        with self._stats_lock:
+            return self.faults.pop(0) if self.faults else None
+
+    def _count(self, key: str, amount: int = 1) -> None:
+        with self._stats_lock:
+            self.stats[key] += amount
+
+    def release(self, owner: str, repo: str) -> Dict:
+        name = f"{repo}_{self.version}_windows_amd64.zip"
+        return {
+            "tag_name": f"v{self.version}",
+            "published_at": "2025-01-01T00:00:00Z",
+            "body": f"{repo} stand-in release",
+            "assets": [{
+                "name": name,
+                "size": len(self.asset),
+                "updated_at": "2025-01-01T00:00:00Z",
+                "browser_download_url": f"{self.url}/assets/{owner}/{repo}/{name}",
+                **({"digest": f"sha256:{sha256(self.asset).hexdigest()}"} if self.asset_digests else {})
+            }]
+        }
+
+    def repository(self, owner: str, repo: str) -> Dict:
+        return {"full_name": f"{owner}/{repo}", "license": {"spdx_id": "MIT"}}
+
+    def _make_handler(self):
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out in separate writes; without this, delayed ACKs add ~40ms per request.
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status: int, body: bytes = b"", headers: Optional[Dict[str, str]] = None) -> None:
+                self.send_response(status)
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if self.command != "HEAD":
+                    self.wfile.write(body)
+                    standin._count("bytes_sent", len(body))
+
+            def _send_stalled(self, body: bytes, headers: Dict[str, str]) -> None:
+                self.send_response(200)
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                half = len(body) // 2
+                self.wfile.write(body[:half])
+                self.wfile.flush()
+                time.sleep(standin.body_stall)
+                try:
+                    self.wfile.write(body[half:])
+                except OSError:
+                    pass
+
+            def _send_fault(self) -> bool:
+                fault = standin._take_fault()
+                if fault:
+                    self._send(fault[0], b'{"message": "stand-in fault"}', fault[1])
+                return fault is not None
+
+            def _send_json(self, payload) -> None:
+                body = json.dumps(payload).encode()
+                etag = f'"{sha256(body).hexdigest()[:16]}"'
+                headers = {"ETag": etag, "Content-Type": "application/json",
+                           "X-RateLimit-Remaining": "5000", "X-RateLimit-Reset": str(int(time.time()) + 3600)}
+                if self.headers.get("If-None-Match") == etag:
+                    standin._count("not_modified")
+                    return self._send(304, headers=headers)
+                self._send(200, body, headers)
+
+            def _send_asset(self) -> None:
+                data = standin.asset
+                if self.command == "HEAD" and standin.head_status:
+                    return self._send(standin.head_status, b"<html>denied</html>", {"Content-Type": "text/html"})
+                headers = {"Accept-Ranges": "bytes", "Content-Type": "application/zip",
+                           "ETag": f'"{sha256(data).hexdigest()[:16]}"'}
+                byte_range = self.headers.get("Range")
+                if not byte_range:
+                    if self.command == "GET":
+                        standin._count("asset_downloads")
+                    if self.command == "GET" and standin.body_stall:
+                        return self._send_stalled(data, headers)
+                    return self._send(200, data, headers)
+                start, _, end = byte_range.split("=", 1)[1].partition("-")
+                if start == "":
+                    first, last = max(len(data) - int(end), 0), len(data) - 1
+                else:
+                    first, last = int(start), min(int(end), len(data) - 1) if end else len(data) - 1
+                headers["Content-Range"] = f"bytes {first}-{last}/{len(data)}"
+                self._send(206, data[first:last + 1], headers)
+
+            def do_HEAD(self):
+                self.do_GET()
+
+            def do_GET(self):
+                standin._count("requests")
+                if standin.latency:
+                    time.sleep(standin.latency)
+                if self._send_fault():
+                    return
+                if self.path == "/rate_limit":
+                    reset = int(time.time()) + 3600
+                    return self._send_json({"resources": {"core": {"remaining": 5000, "reset": reset}}})
+                match = ASSET_PATH.match(self.path)
+                if match:
+                    return self._send_asset()
+                if self.path.startswith("/files/"):
+                    body = standin.files.get(self.path[len("/files/"):])
+                    if body is None:
+                        return self._send(404)
+                    return self._send(200, body, {"Content-Type": "text/plain"})
+                match = REPO_PATH.match(self.path)
+                if not match:
+                    return self._send(404)
+                owner, repo, rest = match.group("owner"), match.group("repo"), match.group("rest")
+                if rest == "/releases/latest":
+                    return self._send_json(standin.release(owner, repo))
+                if rest == "/releases":
+                    return self._send_json([standin.release(owner, repo)])
+                return self._send_json(standin.repository(owner, repo))
+
+            def do_POST(self):
+                standin._count("requests")
+                if standin.latency:
+                    time.sleep(standin.latency)
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                if self._send_fault():
+                    return
+                if self.path != "/graphql":
+                    return self._send(404)
+                query = json.loads(body)["query"]
+                data = {}
+                for alias, owner, repo in GRAPHQL_REPO.findall(query):
+                    release = standin.release(owner, repo)
+                    data[alias] = {
+                        "licenseInfo": {"spdxId": "MIT"},
+                        "latestRelease": {
+                            "tagName": release["tag_name"],
+                            "publishedAt": release["published_at"],
+                            "description": release["body"],
+                            "url": f"https://github.com/{owner}/{repo}/releases/tag/{release['tag_name']}",
+                            "releaseAssets": {"nodes": [{
+                                "name": asset["name"],
+                                "size": asset["size"],
+                                "updatedAt": asset["updated_at"],
+                                "downloadUrl": asset["browser_download_url"],
+                                "contentType": "application/zip",
+                                "digest": asset.get("digest")
+                            } for asset in release["assets"]]}
+                        }
+                    }
+                self._send(200, json.dumps({"data": data}).encode(), {
+                    "Content-Type": "application/json", "X-RateLimit-Resource": "graphql",
+                    "X-RateLimit-Remaining": "4990", "X-RateLimit-Reset": str(int(time.time()) + 3600)})
+
+        return Handler
@@ -1,11 +1,114 @@
-from typing import Dict, Optional
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple, Type
+import ast
+import importlib
+import json
+import os
+import threading
+import requests
+from http_session import shared_session
 
 class BaseHandler:
-    def __init__(self, owner: str, repo: str, version: str, release: Dict):
+    # Repository names (case-insensitive) this handler builds manifests for.
+    repos: Tuple[str, ...] = ()
+
+    def __init__(self, owner: str, repo: str, version: str, release: Dict,
+                 session: Optional[requests.Session] = None, patterns: Optional[Dict[str, str]] = None,
+                 resolve_hash: Optional[Callable[[str, Dict], str]] = None):
         self.owner = owner
         self.repo = repo
         self.version = version
         self.release = release
+        self.session = session if session is not None else shared_session()
+        self.patterns = patterns or {}
+        self.resolve_hash = resolve_hash
+
+    def _get_file_hash(self, url: str) -> str:
+        if self.resolve_hash is None:
+            raise RuntimeError(f"{type(self).__name__} was created without a hash resolver")
+        return self.resolve_hash(url, self.release)
 
     def generate(self) -> Dict:
         raise NotImplementedError("Handlers must implement generate()")
+
+
+def _scan_module(path: Path) -> Dict[str, str]:
+    # Read repos = (...) off handler classes without importing the module.
+    entries = {}
+    tree = ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
+    for node in tree.body:
+        if not isinstance(node, ast.ClassDef):
+            continue
+        if not any(isinstance(base, ast.Name) and base.id.endswith("Handler") for base in node.bases):
+            continue
+        for stmt in node.body:
+            if isinstance(stmt, ast.Assign):
+                targets, value = stmt.targets, stmt.value
+            elif isinstance(stmt, ast.AnnAssign) and stmt.value is not None:
+                targets, value = [stmt.target], stmt.value
+            else:
+                continue
+            if any(isinstance(target, ast.Name) and target.id == "repos" for target in targets):
+                for repo in ast.literal_eval(value):
+                    entries[repo.lower()] = node.name
+    return entries
+
+
+class HandlerRegistry:
+    def __init__(self, index_path: Optional[Path] = None, package: str = __name__):
+        self.package = package
+        self.handler_dir = Path(importlib.import_module(package).__file__).parent
+        self.index_path = index_path
+        self._index: Optional[Dict[str, Tuple[str, str]]] = None
+        self._loaded: Dict[str, Type[BaseHandler]] = {}
+        self._lock = threading.Lock()
+
+    def _build_index(self) -> Dict[str, Tuple[str, str]]:
+        cached = {}
+        if self.index_path and self.index_path.exists():
+            try:
+                cached = json.loads(self.index_path.read_text(encoding="utf-8"))
+            except ValueError:
+                cached = {}
+
+        modules = {}
+        dirty = False
+        for path in sorted(self.handler_dir.glob("*.py")):
+            if path.name == "__init__.py":
+                continue
+            stat = path.stat()
+            signature = [stat.st_mtime_ns, stat.st_size]
+            entry = cached.get(path.stem)
+            if not entry or entry["signature"] != signature:
+                entry = {"signature": signature, "repos": _scan_module(path)}
+                dirty = True
+            modules[path.stem] = entry
+        dirty = dirty or set(modules) != set(cached)
+
+        if dirty and self.index_path:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.index_path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(modules), encoding="utf-8")
+            os.replace(tmp_path, self.index_path)
+
+        index = {}
+        for module, entry in modules.items():
+            for repo, class_name in entry["repos"].items():
+                index[repo] = (module, class_name)
+        return index
+
+    def get(self, repo: str) -> Optional[Type[BaseHandler]]:
+        key = repo.lower()
+        with self._lock:
+            if self._index is None:
+                self._index = self._build_index()
+            if key in self._loaded:
+                return self._loaded[key]
+            target = self._index.get(key)
+            if target is None:
+                return None
+            module_name, class_name = target
+            module = importlib.import_module(f".{module_name}", self.package)
+            handler_class = getattr(module, class_name)
+            self._loaded[key] = handler_class
+            return handler_class
@@ -1,18 +1,23 @@
 from . import BaseHandler
 from typing import Dict
 
-class DiveHandler(BaseHandler):
+class ChatboxHandler(BaseHandler):
+    repos = ("chatbox",)
+
     def generate(self) -> Dict:
-        clean_version = self.version.lstrip('v')
-        current_url = f"https://github.com/{self.owner}/{self.repo}/releases/download/v{clean_version}/dive_{clean_version}_windows_amd64.zip"
+        current_url = f"https://github.com/{self.owner}/{self.repo}/releases/download/v{self.version}/Chatbox.CE-{self.version}-Setup.exe#/dl.exe"
         
         return {
-            "description": "A tool for exploring a docker image, layer contents, and discovering ways to shrink the size of your Docker/OCI image",
-            "bin": "dive.exe",
+            "description": (self.release.get("body") or "").split("\n")[0].lstrip("> ").strip(),
+            "bin": [["Chatbox CE\\Chatbox CE.exe", "chatbox"]],
+            "shortcuts": [["Chatbox CE\\Chatbox CE.exe", "Chatbox CE"]],
             "architecture": {
                 "64bit": {
                     "url": current_url,
-                    "hash": self._get_file_hash(current_url)
+                    "hash": self._get_file_hash(current_url),
+                    "installer": {
+                        "script": "Start-Process -Wait \"$dir\\dl.exe\" -ArgumentList \"/VERYSILENT /SUPPRESSMSGBOXES /NORESTART /SP- /DIR=`\"$dir\\Chatbox CE`\"\"" 
+                    }
                 }
             },
             "checkver": {
@@ -22,8 +27,8 @@ class DiveHandler(BaseHandler):
             "autoupdate": {
                 "architecture": {
                     "64bit": {
-                        "url": f"https://github.com/{self.owner}/{self.repo}/releases/download/v$version/dive_$version_windows_amd64.zip"
+                        "url": f"https://github.com/{self.owner}/{self.repo}/releases/download/v$version/Chatbox.CE-$version-Setup.exe#/dl.exe"
                     }
                 }
             }
-        }
\ No newline at end of file
+        }
@@ -2,6 +2,8 @@ from . import BaseHandler
 from typing import Dict
 
 class DiveHandler(BaseHandler):
+    repos = ("dive",)
+
     def generate(self) -> Dict:
         clean_version = self.version.lstrip('v')
         current_url = f"https://github.com/{self.owner}/{self.repo}/releases/download/v{clean_version}/dive_{clean_version}_windows_amd64.zip"
@@ -0,0 +1,65 @@
+from . import BaseHandler
+from typing import Dict
+import re
+
+RELEASE_DOWNLOAD = "/releases/download/"
+# Checksums, signatures and attestations published next to the real assets.
+SIDECAR_ASSET = re.compile(r"(\.(sha\d*|md5|asc|sig|minisig|pem|sbom|intoto\.jsonl)|sums(\.txt)?)$", re.IGNORECASE)
+
+
+def autoupdate_url(url: str, version: str) -> str:
+    # Only the tag and file name carry the version; owner, repo and host must stay
+    # untouched even when the version is a single digit that also appears there.
+    head, sep, tail = url.partition(RELEASE_DOWNLOAD)
+    if not sep:
+        head, sep, tail = url.rpartition("/")
+    pattern = r"(?:(?<=^)|(?<=[/_+-])|(?<=^[vV])|(?<=[/_+-][vV]))" + re.escape(version) + r"(?![0-9]|\.[0-9])"
+    return head + sep + re.sub(pattern, "$version", tail)
+
+
+class GenericHandler(BaseHandler):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.architectures = list(self.patterns)
+
+    def match_assets(self) -> Dict[str, Dict]:
+        matched = {}
+        if not self.architectures:
+            return matched
+        for asset in self.release.get("assets", []):
+            if SIDECAR_ASSET.search(asset["name"]):
+                continue
+            fits = [arch for arch in self.architectures if self.patterns[arch] in asset["name"]]
+            if not fits:
+                continue
+            # Patterns may overlap ("windows" and "windows-arm64"); the longest one is the most specific.
+            arch = max(fits, key=lambda arch: len(self.patterns[arch]))
+            matched.setdefault(arch, asset)
+            if len(matched) == len(self.architectures):
+                break
+        return matched
+
+    def generate(self) -> Dict:
+        clean_version = self.version.lstrip('v')
+        architecture = {}
+        autoupdate = {}
+        matched = self.match_assets()
+        for arch in self.architectures:
+            if arch not in matched:
+                continue
+            url = matched[arch]["browser_download_url"]
+            architecture[arch] = {
+                "url": url,
+                "hash": self._get_file_hash(url)
+            }
+            autoupdate[arch] = {"url": autoupdate_url(url, clean_version)}
+
+        manifest = {
+            "architecture": architecture,
+            "checkver": {
+                "github": f"https://github.com/{self.owner}/{self.repo}"
+            }
+        }
+        if autoupdate:
+            manifest["autoupdate"] = {"architecture": autoupdate}
+        return manifest
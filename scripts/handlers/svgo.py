@@ -2,6 +2,8 @@ from . import BaseHandler
 from typing import Dict
 
 class SVGOHandler(BaseHandler):
+    repos = ("svgo",)
+
     def generate(self) -> Dict:
         return {
             "version": self.version,
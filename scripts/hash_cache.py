@@ -0,0 +1,66 @@
+from pathlib import Path
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+
+class HashCache:
+    def __init__(self, db_path: Path, max_entries: int = 10000, max_age: float = 180 * 86400):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS hashes ("
+            " url TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " updated_at TEXT NOT NULL,"
+            " etag TEXT NOT NULL,"
+            " sha256 TEXT NOT NULL,"
+            " last_used REAL NOT NULL,"
+            " PRIMARY KEY (url, size, updated_at, etag))"
+        )
+        self._conn.commit()
+
+    def get(self, url: str, size: int, updated_at: str, etag: str) -> Optional[str]:
+        key = (url, size or 0, updated_at or "", etag or "")
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT sha256 FROM hashes WHERE url = ? AND size = ? AND updated_at = ? AND etag = ?",
+                key
+            ).fetchone()
+            if row:
+                self._conn.execute(
+                    "UPDATE hashes SET last_used = ? WHERE url = ? AND size = ? AND updated_at = ? AND etag = ?",
+                    (time.time(), *key)
+                )
+                self._conn.commit()
+        return row[0] if row else None
+
+    def put(self, url: str, size: int, updated_at: str, etag: str, sha256: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO hashes VALUES (?, ?, ?, ?, ?, ?)",
+                (url, size or 0, updated_at or "", etag or "", sha256, time.time())
+            )
+            self._conn.commit()
+
+    def evict(self) -> int:
+        with self._lock:
+            cur = self._conn.execute("DELETE FROM hashes WHERE last_used < ?", (time.time() - self.max_age,))
+            removed = cur.rowcount
+            cur = self._conn.execute(
+                "DELETE FROM hashes WHERE rowid NOT IN"
+                " (SELECT rowid FROM hashes ORDER BY last_used DESC LIMIT ?)",
+                (self.max_entries,)
+            )
+            removed += cur.rowcount
+            self._conn.commit()
+        return removed
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,70 @@
+from pathlib import Path
+import hashlib
+import queue
+import threading
+from typing import BinaryIO, Dict, List, Optional, Sequence
+
+BUFFER_SIZE = 1024 * 1024
+PIPELINE_DEPTH = 4
+
+
+class MultiHasher:
+    def __init__(self, algorithms: Sequence[str] = ("sha256",)):
+        self._hashers = {name: hashlib.new(name) for name in algorithms}
+
+    def update(self, data) -> None:
+        for hasher in self._hashers.values():
+            hasher.update(data)
+
+    def hexdigests(self) -> Dict[str, str]:
+        return {name: hasher.hexdigest() for name, hasher in self._hashers.items()}
+
+
+def hash_stream(stream: BinaryIO, algorithms: Sequence[str] = ("sha256",),
+                buffer_size: int = BUFFER_SIZE, sink: Optional[BinaryIO] = None) -> Dict[str, str]:
+    # The calling thread fills a small ring of reusable buffers with readinto
+    # while a worker thread hashes them; hashlib releases the GIL on large
+    # updates, so reading the next chunk overlaps with hashing the last one.
+    hasher = MultiHasher(algorithms)
+    free: "queue.Queue[bytearray]" = queue.Queue()
+    filled: "queue.Queue[Optional[tuple]]" = queue.Queue()
+    for _ in range(PIPELINE_DEPTH):
+        free.put(bytearray(buffer_size))
+    errors: List[BaseException] = []
+
+    def consume() -> None:
+        while True:
+            item = filled.get()
+            if item is None:
+                return
+            buf, size = item
+            try:
+                view = memoryview(buf)[:size]
+                hasher.update(view)
+                if sink is not None:
+                    sink.write(view)
+            except BaseException as e:
+                errors.append(e)
+            free.put(buf)
+
+    worker = threading.Thread(target=consume, daemon=True)
+    worker.start()
+    try:
+        while not errors:
+            buf = free.get()
+            size = stream.readinto(buf)
+            if not size:
+                free.put(buf)
+                break
+            filled.put((buf, size))
+    finally:
+        filled.put(None)
+        worker.join()
+    if errors:
+        raise errors[0]
+    return hasher.hexdigests()
+
+
+def hash_file(path: Path, algorithms: Sequence[str] = ("sha256",)) -> Dict[str, str]:
+    with open(path, "rb", buffering=0) as f:
+        return hash_stream(f, algorithms)
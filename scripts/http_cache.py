@@ -0,0 +1,84 @@
+from pathlib import Path
+import json
+import hashlib
+import os
+import time
+import threading
+from typing import Dict, Optional
+
+
+class HttpCache:
+    def __init__(self, cache_dir: Path, max_bytes: int = 64 * 1024 * 1024, max_age: float = 30 * 86400):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _entry_path(self, url: str) -> Path:
+        return self.cache_dir / f"{hashlib.sha256(url.encode()).hexdigest()}.json"
+
+    def get(self, url: str) -> Optional[Dict]:
+        path = self._entry_path(url)
+        try:
+            if time.time() - path.stat().st_mtime > self.max_age:
+                return None
+            return json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def conditional_headers(entry: Optional[Dict]) -> Dict[str, str]:
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def put(self, url: str, etag: Optional[str], last_modified: Optional[str], body: str) -> None:
+        if not etag and not last_modified:
+            return
+        entry = {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "body": body
+        }
+        path = self._entry_path(url)
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp_path.write_text(json.dumps(entry), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+    def touch(self, url: str) -> None:
+        # A 304 revalidates the entry, so it counts as freshly stored for age eviction.
+        try:
+            os.utime(self._entry_path(url))
+        except OSError:
+            pass
+
+    def evict(self) -> int:
+        with self._lock:
+            now = time.time()
+            entries = []
+            removed = 0
+            for path in self.cache_dir.glob("*.json"):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                if now - stat.st_mtime > self.max_age:
+                    path.unlink(missing_ok=True)
+                    removed += 1
+                else:
+                    entries.append((stat.st_mtime, stat.st_size, path))
+
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+                removed += 1
+            return removed
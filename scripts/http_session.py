@@ -0,0 +1,112 @@
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import HTTPError
+from urllib3.util.retry import Retry
+
+
+class CircuitOpenError(requests.ConnectionError):
+    pass
+
+
+class _GitHubRetry(Retry):
+    # GitHub signals secondary rate limits with a 403 carrying Retry-After.
+    RETRY_AFTER_STATUS_CODES = frozenset([403, 413, 429, 503])
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int = 5, reset_after: float = 300):
+        self.failure_threshold = failure_threshold
+        self.reset_after = reset_after
+        self._failures: Dict[str, int] = {}
+        self._opened_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def check(self, host: str) -> None:
+        with self._lock:
+            opened_at = self._opened_at.get(host)
+            if opened_at is None:
+                return
+            if time.monotonic() - opened_at < self.reset_after:
+                raise CircuitOpenError(f"Circuit open for {host}, skipping request")
+            # Half-open: let one request through, a single failure re-opens it.
+            del self._opened_at[host]
+            self._failures[host] = self.failure_threshold - 1
+
+    def record_success(self, host: str) -> None:
+        with self._lock:
+            self._failures.pop(host, None)
+
+    def record_failure(self, host: str) -> None:
+        with self._lock:
+            self._failures[host] = self._failures.get(host, 0) + 1
+            if self._failures[host] >= self.failure_threshold:
+                print(f"Too many failures from {host}, pausing requests for {self.reset_after:.0f}s")
+                self._opened_at[host] = time.monotonic()
+
+
+class PooledSession(requests.Session):
+    def __init__(self, timeout: Tuple[float, float] = (10, 60), retries: int = 3,
+                 backoff_factor: float = 1.0, pool_size: int = 32,
+                 breaker: Optional[CircuitBreaker] = None):
+        super().__init__()
+        self.timeout = timeout
+        self.breaker = breaker or CircuitBreaker()
+        retry = _GitHubRetry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(500, 502, 503, 504),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+
+    def request(self, method, url, *args, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        host = urlsplit(url).netloc
+        self.breaker.check(host)
+        try:
+            resp = super().request(method, url, *args, **kwargs)
+        except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError):
+            self.breaker.record_failure(host)
+            raise
+        if resp.status_code >= 500:
+            self.breaker.record_failure(host)
+        else:
+            self.breaker.record_success(host)
+        if kwargs.get("stream"):
+            self._watch_body(resp, host)
+        return resp
+
+    def _watch_body(self, resp: requests.Response, host: str) -> None:
+        # Streamed bodies are read after request() returns (iter_content, hash_stream),
+        # so a stall or reset there has to reach the breaker from the raw read itself.
+        read = resp.raw.read
+        breaker = self.breaker
+
+        def watched_read(*args, **kwargs):
+            try:
+                return read(*args, **kwargs)
+            except (HTTPError, OSError):
+                breaker.record_failure(host)
+                raise
+
+        resp.raw.read = watched_read
+
+
+_shared_session: Optional[PooledSession] = None
+_shared_lock = threading.Lock()
+
+
+def shared_session() -> PooledSession:
+    global _shared_session
+    with _shared_lock:
+        if _shared_session is None:
+            _shared_session = PooledSession()
+        return _shared_session
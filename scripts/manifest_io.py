@@ -0,0 +1,24 @@
+from pathlib import Path
+import json
+import os
+from typing import Dict
+
+
+def canonical_json(manifest: Dict) -> str:
+    # Keep non-ASCII text as is; \uXXXX escapes would rewrite every manifest that has it.
+    return json.dumps(manifest, indent=4, ensure_ascii=False) + "\n"
+
+
+def write_if_changed(path: Path, text: str) -> bool:
+    # Git checks text files out with CRLF endings, so compare ignoring them.
+    new_bytes = text.encode("utf-8")
+    try:
+        if path.read_bytes().replace(b"\r\n", b"\n") == new_bytes.replace(b"\r\n", b"\n"):
+            return False
+    except FileNotFoundError:
+        pass
+    # Write beside the target and rename, so a crash never leaves a truncated file.
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_bytes(new_bytes)
+    os.replace(tmp_path, path)
+    return True
@@ -0,0 +1,130 @@
+from pathlib import Path
+import contextlib
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, Iterator
+
+RUN_SCOPE = "_run"
+
+
+class RunMetrics:
+    def __init__(self):
+        self.started_at = time.time()
+        self._started = time.perf_counter()
+        self._durations: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+        self._calls: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self._counters: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @property
+    def current_app(self) -> str:
+        return getattr(self._local, "app", RUN_SCOPE)
+
+    @contextlib.contextmanager
+    def app(self, name: str) -> Iterator[None]:
+        previous = getattr(self._local, "app", None)
+        self._local.app = name
+        try:
+            yield
+        finally:
+            self._local.app = previous if previous is not None else RUN_SCOPE
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        app = self.current_app
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self._durations[app][name] += elapsed
+                self._calls[app][name] += 1
+
+    def count(self, name: str, amount: int = 1) -> None:
+        app = self.current_app
+        with self._lock:
+            self._counters[app][name] += amount
+
+    def report(self) -> Dict:
+        with self._lock:
+            apps = {}
+            for app in sorted(set(self._durations) | set(self._counters)):
+                apps[app] = {
+                    "phases": {
+                        phase: {"seconds": round(seconds, 6), "calls": self._calls[app][phase]}
+                        for phase, seconds in sorted(self._durations[app].items())
+                    },
+                    "counters": dict(sorted(self._counters[app].items()))
+                }
+        totals = {"phases": defaultdict(lambda: {"seconds": 0.0, "calls": 0}), "counters": defaultdict(int)}
+        for entry in apps.values():
+            for phase, stats in entry["phases"].items():
+                totals["phases"][phase]["seconds"] += stats["seconds"]
+                totals["phases"][phase]["calls"] += stats["calls"]
+            for counter, value in entry["counters"].items():
+                totals["counters"][counter] += value
+        # Phases nest (total covers generate, which covers hash and license), so
+        # summing them would count the same time several times.
+        slowest = sorted(
+            ((app, entry["phases"].get("total", {}).get("seconds", 0.0))
+             for app, entry in apps.items() if app != RUN_SCOPE),
+            key=lambda item: item[1], reverse=True
+        )
+        return {
+            "started_at": self.started_at,
+            "wall_seconds": round(time.perf_counter() - self._started, 6),
+            "totals": {"phases": dict(totals["phases"]), "counters": dict(totals["counters"])},
+            "slowest_apps": [{"app": app, "seconds": round(seconds, 6)} for app, seconds in slowest[:10]],
+            "apps": apps
+        }
+
+    def write_json(self, path: Path) -> None:
+        _atomic_write(path, json.dumps(self.report(), indent=2))
+
+    def write_prometheus(self, path: Path) -> None:
+        report = self.report()
+        lines = [
+            "# HELP treblescoop_run_seconds Wall time of the last updater run.",
+            "# TYPE treblescoop_run_seconds gauge",
+            f"treblescoop_run_seconds {report['wall_seconds']}",
+            "# HELP treblescoop_run_timestamp_seconds Start time of the last updater run.",
+            "# TYPE treblescoop_run_timestamp_seconds gauge",
+            f"treblescoop_run_timestamp_seconds {report['started_at']:.0f}",
+            "# HELP treblescoop_phase_seconds Time spent per app and phase in the last run.",
+            "# TYPE treblescoop_phase_seconds gauge",
+        ]
+        for app, entry in report["apps"].items():
+            for phase, stats in entry["phases"].items():
+                lines.append(f'treblescoop_phase_seconds{{app="{_escape(app)}",phase="{phase}"}} {stats["seconds"]}')
+        lines += [
+            "# HELP treblescoop_phase_calls Calls per app and phase in the last run.",
+            "# TYPE treblescoop_phase_calls gauge",
+        ]
+        for app, entry in report["apps"].items():
+            for phase, stats in entry["phases"].items():
+                lines.append(f'treblescoop_phase_calls{{app="{_escape(app)}",phase="{phase}"}} {stats["calls"]}')
+        lines += [
+            "# HELP treblescoop_events Bytes, cache hits and retries per app in the last run.",
+            "# TYPE treblescoop_events gauge",
+        ]
+        for app, entry in report["apps"].items():
+            for counter, value in entry["counters"].items():
+                lines.append(f'treblescoop_events{{app="{_escape(app)}",event="{counter}"}} {value}')
+        _atomic_write(path, "\n".join(lines) + "\n")
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def _atomic_write(path: Path, text: str) -> None:
+    # node_exporter's textfile collector may read at any moment, so never expose a partial file.
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(text, encoding="utf-8")
+    os.replace(tmp_path, path)
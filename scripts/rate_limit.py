@@ -0,0 +1,71 @@
+import threading
+import time
+from typing import Optional
+
+import requests
+
+
+class RateLimitExceeded(requests.RequestException):
+    pass
+
+
+class RateLimiter:
+    def __init__(self, reserve: int = 20, low_water: int = 200, max_wait: float = 60):
+        self.reserve = reserve
+        self.low_water = low_water
+        self.max_wait = max_wait
+        self.remaining: Optional[int] = None
+        self.reset_at: Optional[float] = None
+        self._blocked_until = 0.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def update(self, resp: requests.Response) -> None:
+        with self._lock:
+            remaining = resp.headers.get("X-RateLimit-Remaining")
+            reset = resp.headers.get("X-RateLimit-Reset")
+            if remaining is not None:
+                self.remaining = int(remaining)
+            if reset is not None:
+                self.reset_at = float(reset)
+            retry_after = resp.headers.get("Retry-After")
+            if retry_after is not None and resp.status_code in (403, 429):
+                self._blocked_until = max(self._blocked_until, time.time() + float(retry_after))
+
+    def update_from_status(self, remaining: int, reset_at: float) -> None:
+        with self._lock:
+            self.remaining = remaining
+            self.reset_at = reset_at
+
+    def budget(self) -> Optional[int]:
+        with self._lock:
+            if self.remaining is None:
+                return None
+            if self.reset_at is not None and time.time() >= self.reset_at:
+                return None
+            return max(self.remaining - self.reserve, 0)
+
+    def acquire(self) -> None:
+        with self._lock:
+            now = time.time()
+            wait = max(self._blocked_until - now, 0)
+            if wait > self.max_wait:
+                raise RateLimitExceeded(f"GitHub asked to retry in {wait:.0f}s")
+            if self.remaining is not None and self.reset_at is not None and now < self.reset_at:
+                if self.remaining <= self.reserve:
+                    reset_in = self.reset_at - now
+                    if reset_in > self.max_wait:
+                        # Refused calls take no slot and no quota, so later calls are unaffected.
+                        raise RateLimitExceeded(f"GitHub rate limit exhausted, resets in {reset_in:.0f}s")
+                    wait = max(wait, reset_in)
+                elif self.remaining < self.low_water:
+                    # Spread what is left over the reset window. The scheduler already
+                    # sized the run to the budget, so pacing only smooths bursts and
+                    # never delays a call by more than max_wait.
+                    interval = min((self.reset_at - now) / (self.remaining - self.reserve), self.max_wait)
+                    slot = min(max(self._next_slot, now), now + self.max_wait)
+                    self._next_slot = slot + interval
+                    wait = max(wait, slot - now)
+                self.remaining -= 1
+        if wait > 0:
+            time.sleep(wait)
@@ -0,0 +1,50 @@
+from datetime import datetime, timedelta, timezone
+from statistics import median
+from typing import Dict, List, Optional
+
+MIN_INTERVAL_HOURS = 4
+MAX_INTERVAL_HOURS = 7 * 24
+# Poll several times per typical release gap so new releases are picked up
+# reasonably soon after they land.
+POLLS_PER_RELEASE = 4
+
+
+def parse_timestamp(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def format_timestamp(value: datetime) -> str:
+    return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def learn_cadence(releases: List[Dict]) -> Optional[Dict]:
+    published = sorted(
+        parse_timestamp(release["published_at"])
+        for release in releases
+        if release.get("published_at") and not release.get("draft") and not release.get("prerelease")
+    )
+    if len(published) < 2:
+        return None
+    gaps = [(later - earlier).total_seconds() / 3600 for earlier, later in zip(published, published[1:])]
+    return {
+        "median_interval_hours": round(median(gaps), 2),
+        "samples": len(gaps)
+    }
+
+
+def poll_interval_hours(cadence: Optional[Dict]) -> float:
+    if not cadence or not cadence.get("median_interval_hours"):
+        return MIN_INTERVAL_HOURS
+    interval = cadence["median_interval_hours"] / POLLS_PER_RELEASE
+    return min(max(interval, MIN_INTERVAL_HOURS), MAX_INTERVAL_HOURS)
+
+
+def schedule_next_check(cadence: Optional[Dict], now: datetime) -> str:
+    return format_timestamp(now + timedelta(hours=poll_interval_hours(cadence)))
+
+
+def is_due(info: Dict, now: datetime) -> bool:
+    next_check = (info.get("cadence") or {}).get("next_check")
+    if not next_check:
+        return True
+    return parse_timestamp(next_check) <= now
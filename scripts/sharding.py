@@ -0,0 +1,37 @@
+from pathlib import Path
+import hashlib
+import json
+import shutil
+from typing import Dict, List, Tuple
+
+# Only these keys are written by an update run; patterns stay owned by tracked_apps.yml itself.
+DELTA_KEYS = ("last_checked", "cadence")
+
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    index, _, count = value.partition("/")
+    shard = (int(index), int(count))
+    if shard[1] < 1 or not 0 <= shard[0] < shard[1]:
+        raise ValueError(f"Shard must be i/N with 0 <= i < N, got {value}")
+    return shard
+
+
+def shard_of(repo_full_name: str, count: int) -> int:
+    # hash() is salted per process, so use a digest that every matrix worker agrees on.
+    digest = hashlib.sha256(repo_full_name.lower().encode()).digest()
+    return int.from_bytes(digest[:8], "big") % count
+
+
+def write_shard_artifacts(output_dir: Path, manifest_paths: List[Path], apps: Dict[str, Dict]) -> None:
+    manifest_dir = output_dir / "bucket"
+    manifest_dir.mkdir(parents=True, exist_ok=True)
+    for path in manifest_paths:
+        shutil.copyfile(path, manifest_dir / path.name)
+    delta = {name: {key: info[key] for key in DELTA_KEYS if key in info} for name, info in apps.items()}
+    (output_dir / "config_delta.json").write_text(json.dumps(delta, indent=2, sort_keys=True), encoding="utf-8")
+
+
+def read_shard_artifacts(shard_dir: Path) -> Tuple[List[Path], Dict[str, Dict]]:
+    delta_path = shard_dir / "config_delta.json"
+    delta = json.loads(delta_path.read_text(encoding="utf-8")) if delta_path.exists() else {}
+    return sorted((shard_dir / "bucket").glob("*.json")), delta
@@ -1,116 +1,311 @@
 from pathlib import Path
 import json
 import requests
-from typing import Dict, List, Optional
-from datetime import datetime
-import hashlib
-import yaml
+from typing import Dict, List, Optional, Sequence, Tuple
+from datetime import datetime, timezone
+import re
 import subprocess
+import argparse
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from http_cache import HttpCache
+from hash_cache import HashCache
+from github_graphql import fetch_latest_releases
+from http_session import PooledSession, shared_session
+from rate_limit import RateLimitExceeded, RateLimiter
+from hashing import hash_file, hash_stream
+from artifact_store import ArtifactStore
+from zip_inspect import inspect_zip
+from handlers import HandlerRegistry
+from handlers.generic import GenericHandler
+from manifest_io import canonical_json, write_if_changed
+from metrics import RunMetrics
+from config_store import ConfigStore
+from bucket_index import BucketIndex
+from validate_manifests import default_schema_path, validate_manifest
+from cassette import RECORD, REPLAY, Cassette
+from sharding import parse_shard, read_shard_artifacts, shard_of, write_shard_artifacts
+from release_cadence import is_due, learn_cadence, schedule_next_check
+
+CHECKSUM_FILE_PATTERN = re.compile(r"(?i)(sha256sums?|checksums?)(\.txt)?$|\.sha256(sum)?$")
+SHA256_LINE_PATTERN = re.compile(r"^([0-9a-fA-F]{64})(?:\s+\*?(\S.*))?$")
+
+
+def probe_url(session: requests.Session, url: str) -> requests.Response:
+    resp = session.head(url, allow_redirects=True)
+    if resp.status_code in (403, 405, 501):
+        # Some CDNs reject HEAD; a one-byte ranged GET is the next cheapest probe.
+        with session.get(url, headers={"Range": "bytes=0-0"}, stream=True, allow_redirects=True) as ranged:
+            resp = ranged
+    return resp
+
+
+def probe_hash_key(url: str, resp: requests.Response) -> Optional[Tuple[str, int, str, str]]:
+    # Hash cache key for URLs that are not release assets, from a probe_url response.
+    # An error page or a response without validators says nothing about the file, so no key.
+    if resp.status_code not in (200, 206):
+        return None
+    size = resp.headers.get("Content-Length", 0)
+    if resp.status_code == 206:
+        # Content-Range: bytes <first>-<last>/<total>; Content-Length is only the range.
+        size = resp.headers.get("Content-Range", "").rpartition("/")[2] or 0
+    key = url, int(size), resp.headers.get("Last-Modified", ""), resp.headers.get("ETag", "")
+    return key if any(key[1:]) else None
+
 
 class TrebleScoopUpdater:
-    def __init__(self, repo_path: Path, github_token: str):
+    def __init__(self, repo_path: Path, github_token: str, verify: bool = False,
+                 api_url: str = "https://api.github.com", session: Optional[requests.Session] = None,
+                 artifact_store: Optional[ArtifactStore] = None,
+                 scoop_cache_dir: Optional[Path] = None, cassette: Optional[Cassette] = None):
         self.repo_path = repo_path
         self.bucket_path = repo_path / "bucket"
-        self.headers = {"Authorization": f"token {github_token}"}
+        self.headers = {"Authorization": f"token {github_token}"} if github_token else {}
         self.config_path = repo_path / "scripts" / "tracked_apps.yml"
+        self.config_store = ConfigStore(self.config_path, repo_path / "scripts" / ".cache" / "tracked_apps.snapshot.json")
+        self.http_cache = HttpCache(repo_path / "scripts" / ".cache" / "http")
+        self.hash_cache = HashCache(repo_path / "scripts" / ".cache" / "hashes.sqlite3")
+        self.verify = verify
+        self.artifact_store = artifact_store
+        self.scoop_cache_dir = scoop_cache_dir
+        self.cassette = cassette
+        self.schema_path = default_schema_path()
+        self.bucket_index = BucketIndex(self.bucket_path, repo_path / "scripts" / ".cache" / "bucket_index.json")
+        self.handlers = HandlerRegistry(repo_path / "scripts" / ".cache" / "handler_index.json")
+        self.api_url = api_url.rstrip("/")
+        self.session = session if session is not None else shared_session()
+        self.rate_limiter = RateLimiter()
+        # GraphQL has its own points quota, reported in the same headers, so it is paced separately.
+        self.graphql_limiter = RateLimiter()
+        self.metrics = RunMetrics()
+        self._prefetched: Dict[str, Dict] = {}
         self._ensure_config()
 
     def _ensure_config(self) -> None:
         if not self.config_path.parent.exists():
             self.config_path.parent.mkdir(parents=True)
         if not self.config_path.exists():
-            self.config_path.write_text(yaml.dump({"apps": {}}))
+            self.config_store.save({"apps": {}})
 
     def track_app(self, owner: str, repo: str, patterns: Dict[str, str]) -> None:
-        config = yaml.safe_load(self.config_path.read_text())
-        config["apps"] = config.get("apps", {})
-        config["apps"][f"{owner}/{repo}"] = {
-            "patterns": patterns,
-            "last_checked": None
-        }
-        self.config_path.write_text(yaml.dump(config))
+        self.track_apps({f"{owner}/{repo}": patterns})
 
-    def _get_latest_release(self, owner: str, repo: str) -> Optional[Dict]:
-        resp = requests.get(f"https://api.github.com/repos/{owner}/{repo}/releases/latest", headers=self.headers)
-        return resp.json() if resp.status_code == 200 else None
+    def track_apps(self, apps: Dict[str, Dict[str, str]]) -> None:
+        config = self.config_store.load() or {}
+        config["apps"] = config.get("apps") or {}
+        for repo_full_name, patterns in apps.items():
+            config["apps"][repo_full_name] = {
+                "patterns": patterns,
+                "last_checked": None
+            }
+        self.config_store.save(config)
 
-    def _get_file_hash(self, url: str) -> str:
-        print(f"Downloading and hashing: {url}")
-        response = requests.get(url, stream=True)
-        sha256_hash = hashlib.sha256()
-        for chunk in response.iter_content(chunk_size=8192):
-            if chunk:
-                sha256_hash.update(chunk)
-        return sha256_hash.hexdigest()
+    def _api_request(self, method: str, url: str, limiter: RateLimiter, **kwargs) -> requests.Response:
+        limiter.acquire()
+        resp = self.session.request(method, url, **kwargs)
+        limiter.update(resp)
+        self.metrics.count("api_requests")
+        retries = getattr(resp.raw, "retries", None)
+        if retries is not None and retries.history:
+            self.metrics.count("retries", len(retries.history))
+        return resp
 
-    def _get_repo_license(self, owner: str, repo: str) -> Optional[str]:
+    def _api_get(self, url: str) -> Optional[Dict]:
+        cached = self.http_cache.get(url)
+        headers = {**self.headers, **HttpCache.conditional_headers(cached)}
+        resp = self._api_request("GET", url, self.rate_limiter, headers=headers)
+        if resp.status_code == 304 and cached:
+            self.metrics.count("http_cache_hits")
+            self.http_cache.touch(url)
+            return json.loads(cached["body"])
+        # A 403 is also used for missing permissions and abuse denials; only an exhausted
+        # quota, a 429 or a Retry-After makes it rate limiting.
+        if resp.status_code == 429 or "Retry-After" in resp.headers or (
+                resp.status_code == 403 and resp.headers.get("X-RateLimit-Remaining") == "0"):
+            print(f"Rate limited on {url} (remaining: {resp.headers.get('X-RateLimit-Remaining', '?')}, "
+                  f"reset: {resp.headers.get('X-RateLimit-Reset', '?')})")
+            return None
+        if resp.status_code != 200:
+            try:
+                message = resp.json().get("message") or resp.reason
+            except (ValueError, AttributeError):
+                message = resp.reason
+            print(f"GitHub API request {url} failed with status {resp.status_code}: {message}")
+            return None
+        self.http_cache.put(url, resp.headers.get("ETag"), resp.headers.get("Last-Modified"), resp.text)
+        return resp.json()
+
+    def _refresh_rate_limit(self) -> None:
+        # /rate_limit itself does not count against the quota.
         try:
-            resp = requests.get(
-                f"https://api.github.com/repos/{owner}/{repo}",
-                headers=self.headers
-            )
+            resp = self.session.get(f"{self.api_url}/rate_limit", headers=self.headers)
             if resp.status_code == 200:
-                return resp.json().get("license", {}).get("spdx_id")
-        except:
-            pass
+                core = resp.json()["resources"]["core"]
+                self.rate_limiter.update_from_status(core["remaining"], core["reset"])
+        except (requests.RequestException, KeyError, ValueError) as e:
+            print(f"Could not read rate limit status: {e}")
+
+    def _schedule_apps(self, apps: List[Tuple[str, Dict]], calls_per_app: int) -> List[Tuple[str, Dict]]:
+        # Never-checked apps first, then the most recently released ones, which
+        # are the most active and so the most likely to have something new.
+        ordered = sorted(apps, key=lambda app: str(app[1].get("last_checked") or ""), reverse=True)
+        ordered.sort(key=lambda app: app[1].get("last_checked") is not None)
+
+        budget = self.rate_limiter.budget()
+        if budget is None or calls_per_app == 0 or budget >= len(ordered) * calls_per_app:
+            return ordered
+        selected = ordered[:budget // calls_per_app]
+        deferred = [repo_full_name for repo_full_name, _ in ordered[len(selected):]]
+        print(f"Rate limit budget covers {len(selected)}/{len(ordered)} apps, deferring: {', '.join(deferred)}")
+        return selected
+
+    def _prefetch_releases(self, repos: List[str]) -> None:
+        endpoint = f"{self.api_url}/graphql"
+        try:
+            self._prefetched = fetch_latest_releases(
+                endpoint, self.headers, repos,
+                post=lambda body: self._api_request("POST", endpoint, self.graphql_limiter, headers=self.headers, json=body))
+        except RateLimitExceeded as e:
+            print(f"GraphQL prefetch stopped, falling back to REST: {e}")
+            self._prefetched = {}
+            return
+        print(f"Prefetched {len(self._prefetched)}/{len(repos)} apps via GraphQL")
+
+    def _get_latest_release(self, owner: str, repo: str) -> Optional[Dict]:
+        prefetched = self._prefetched.get(f"{owner}/{repo}")
+        if prefetched:
+            return prefetched["release"]
+        with self.metrics.phase("latest_release"):
+            return self._api_get(f"{self.api_url}/repos/{owner}/{repo}/releases/latest")
+
+    def _find_asset(self, release: Optional[Dict], url: str) -> Optional[Dict]:
+        url = url.split("#")[0]
+        for asset in (release or {}).get("assets", []):
+            if asset.get("browser_download_url") == url:
+                return asset
         return None
 
-    def _handle_dive(self, owner: str, repo: str, version: str, release: Dict) -> Dict:
-        clean_version = version.lstrip('v')
-        current_url = f"https://github.com/{owner}/{repo}/releases/download/v{clean_version}/dive_{clean_version}_windows_amd64.zip"
-        
-        return {
-            "description": "A tool for exploring a docker image, layer contents, and discovering ways to shrink the size of your Docker/OCI image",
-            "bin": "dive.exe",
-            "architecture": {
-                "64bit": {
-                    "url": current_url,
-                    "hash": self._get_file_hash(current_url)
-                }
-            },
-            "checkver": {
-                "github": f"https://github.com/{owner}/{repo}",
-                "regex": "(?i)releases/tag/v?([\\d.]+)"
-            },
-            "autoupdate": {
-                "architecture": {
-                    "64bit": {
-                        "url": f"https://github.com/{owner}/{repo}/releases/download/v$version/dive_$version_windows_amd64.zip"
-                    }
-                }
-            }
-        }
+    def _get_file_hash(self, url: str, release: Optional[Dict] = None) -> str:
+        url = url.split("#")[0]
+        asset = self._find_asset(release, url)
+        if asset:
+            key = (url, asset.get("size"), asset.get("updated_at"), "")
+        else:
+            key = probe_hash_key(url, probe_url(self.session, url))
 
-    def _handle_chatbox(self, owner: str, repo: str, version: str, release: Dict) -> Dict:
-        current_url = f"https://github.com/{owner}/{repo}/releases/download/v{version}/Chatbox.CE-{version}-Setup.exe#/dl.exe"
-        
-        return {
-            "description": release.get("body", "").split("\n")[0].lstrip("> ").strip(),
-            "bin": [["Chatbox CE\\Chatbox CE.exe", "chatbox"]],
-            "shortcuts": [["Chatbox CE\\Chatbox CE.exe", "Chatbox CE"]],
-            "architecture": {
-                "64bit": {
-                    "url": current_url,
-                    "hash": self._get_file_hash(current_url.split('#')[0]),
-                    "installer": {
-                        "script": "Start-Process -Wait \"$dir\\dl.exe\" -ArgumentList \"/VERYSILENT /SUPPRESSMSGBOXES /NORESTART /SP- /DIR=`\"$dir\\Chatbox CE`\"\"" 
-                    }
-                }
-            },
-            "checkver": {
-                "github": f"https://github.com/{owner}/{repo}",
-                "regex": "(?i)releases/tag/v?([\\d.]+)"
-            },
-            "autoupdate": {
-                "architecture": {
-                    "64bit": {
-                        "url": f"https://github.com/{owner}/{repo}/releases/download/v$version/Chatbox.CE-$version-Setup.exe#/dl.exe"
-                    }
-                }
-            }
-        }
+        if key and not self.verify:
+            cached = self.hash_cache.get(*key)
+            if cached:
+                self.metrics.count("hash_cache_hits")
+                return cached
+
+        digest = self._download_hashes(url, key[1:] if key else ())["sha256"]
+        if key:
+            self.hash_cache.put(*key, digest)
+        return digest
+
+    def _download_hashes(self, url: str, validator: Tuple = (),
+                         algorithms: Sequence[str] = ("sha256",)) -> Dict[str, str]:
+        # Every requested digest comes out of one streamed pass; sha256 is always
+        # included because the hash cache and artifact store are keyed on it.
+        algorithms = tuple(dict.fromkeys(("sha256", *algorithms)))
+        store = self.artifact_store
+        if store and validator and not self.verify:
+            digest = store.lookup(url, validator)
+            if digest:
+                self.metrics.count("artifact_store_hits")
+                if algorithms == ("sha256",):
+                    return {"sha256": digest}
+                return hash_file(store.blob_path(digest), algorithms)
+
+        if self.cassette and algorithms == ("sha256",):
+            digest = self.cassette.recorded_digest(url)
+            if digest:
+                return {"sha256": digest}
+
+        print(f"Downloading and hashing: {url}")
+        with self.session.get(url, stream=True) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            if not store:
+                digests = hash_stream(response.raw, algorithms)
+                self.metrics.count("bytes_downloaded", response.raw.tell())
+                return digests
+            with store.open_temp() as tmp:
+                try:
+                    digests = hash_stream(response.raw, algorithms, sink=tmp)
+                except BaseException:
+                    tmp.close()
+                    os.unlink(tmp.name)
+                    raise
+            self.metrics.count("bytes_downloaded", response.raw.tell())
+        store.commit(Path(tmp.name), digests["sha256"], url, validator)
+        return digests
+
+    def _seed_scoop_cache(self, app: str, manifest: Dict) -> None:
+        if not self.artifact_store or not self.scoop_cache_dir:
+            return
+        entries = [manifest, *manifest.get("architecture", {}).values()]
+        for entry in entries:
+            if "url" in entry:
+                self.artifact_store.seed_scoop_cache(self.scoop_cache_dir, app, manifest["version"], entry["url"])
+
+    def _published_hash(self, release: Optional[Dict], url: str) -> Optional[str]:
+        asset = self._find_asset(release, url)
+        if not asset:
+            return None
+
+        digest = asset.get("digest") or ""
+        if digest.startswith("sha256:"):
+            return digest.split(":", 1)[1].lower()
+
+        name = asset["name"]
+        for checksum_asset in release.get("assets", []):
+            checksum_name = checksum_asset["name"]
+            if checksum_name == name or not CHECKSUM_FILE_PATTERN.search(checksum_name):
+                continue
+            # Per-file checksums (foo.zip.sha256) only cover their own asset.
+            if checksum_name.lower().endswith((".sha256", ".sha256sum")) and not checksum_name.startswith(name):
+                continue
+            resp = self.session.get(checksum_asset["browser_download_url"])
+            if resp.status_code != 200:
+                continue
+            for line in resp.text.splitlines():
+                match = SHA256_LINE_PATTERN.match(line.strip())
+                if match and (match.group(2) is None or match.group(2).strip() == name):
+                    return match.group(1).lower()
+        return None
+
+    def _resolve_hash(self, url: str, release: Optional[Dict] = None) -> str:
+        with self.metrics.phase("hash"):
+            published = None if self.verify else self._published_hash(release, url)
+            if published:
+                self.metrics.count("published_hash_hits")
+                return published
+            return self._get_file_hash(url, release)
+
+    def _get_repo_license(self, owner: str, repo: str) -> Optional[str]:
+        prefetched = self._prefetched.get(f"{owner}/{repo}")
+        if prefetched:
+            return prefetched["license"]
+        try:
+            with self.metrics.phase("license"):
+                data = self._api_get(f"{self.api_url}/repos/{owner}/{repo}")
+            if data:
+                return (data.get("license") or {}).get("spdx_id")
+        except RateLimitExceeded:
+            # Fail the app rather than overwrite its license with "Unknown".
+            raise
+        except (requests.RequestException, ValueError) as e:
+            print(f"Could not read license of {owner}/{repo}: {e}")
+        return None
 
     def _generate_manifest(self, repo_full_name: str, release: Dict, patterns: Dict) -> Dict:
+        with self.metrics.phase("generate"):
+            return self._build_manifest(repo_full_name, release, patterns)
+
+    def _build_manifest(self, repo_full_name: str, release: Dict, patterns: Dict) -> Dict:
         owner, repo = repo_full_name.split("/")
         version = release["tag_name"].lstrip("v")
         
@@ -122,53 +317,232 @@ class TrebleScoopUpdater:
             "architecture": {}
         }
 
-        if repo.lower() == "dive":
-            manifest.update(self._handle_dive(owner, repo, version, release))
-        elif repo.lower() == "chatbox":
-            manifest.update(self._handle_chatbox(owner, repo, version, release))
+        handler_class = self.handlers.get(repo) or GenericHandler
+        handler = handler_class(owner, repo, version, release, session=self.session,
+                                patterns=patterns, resolve_hash=self._resolve_hash)
+        manifest.update(handler.generate())
+        if handler_class is GenericHandler:
+            self._apply_zip_layout(manifest, repo)
         
         return manifest
 
-    def update_manifests(self) -> None:
+    def _apply_zip_layout(self, manifest: Dict, app_name: str) -> None:
+        if "bin" in manifest:
+            return
+        for entry in manifest["architecture"].values():
+            if not entry["url"].split("#")[0].lower().endswith(".zip"):
+                continue
+            layout = inspect_zip(self.session, entry["url"], app_name)
+            if layout:
+                for key, value in layout.items():
+                    manifest.setdefault(key, value)
+                extract_dir = manifest.get("extract_dir", "")
+                if "autoupdate" in manifest and manifest["version"] in extract_dir:
+                    manifest["autoupdate"]["extract_dir"] = extract_dir.replace(manifest["version"], "$version")
+                return
+
+    def _get_release_history(self, owner: str, repo: str) -> List[Dict]:
+        return self._api_get(f"{self.api_url}/repos/{owner}/{repo}/releases?per_page=30") or []
+
+    def _process_app(self, repo_full_name: str, info: Dict, force: bool = False) -> Optional[Dict]:
+        with self.metrics.app(repo_full_name), self.metrics.phase("total"):
+            try:
+                return self._check_app(repo_full_name, info, force)
+            except requests.RequestException as e:
+                self.metrics.count("errors")
+                print(f"Failed to update {repo_full_name}: {e}")
+                return None
+
+    def _check_app(self, repo_full_name: str, info: Dict, force: bool) -> Optional[Dict]:
+        print(f"Checking {repo_full_name}")
+        owner, repo = repo_full_name.split("/")
+        release = self._get_latest_release(owner, repo)
+
+        if not release:
+            print(f"No release found for {repo_full_name}")
+            return None
+
+        result = {
+            "release": release,
+            "manifest_path": self.bucket_path / f"{repo}.json",
+            "manifest": None,
+            "cadence": None
+        }
+        up_to_date = not force and self._is_up_to_date(result["manifest_path"], info, release)
+        if not up_to_date or "cadence" not in info:
+            with self.metrics.phase("release_history"):
+                result["cadence"] = learn_cadence(self._get_release_history(owner, repo))
+        if up_to_date:
+            print(f"{repo_full_name} is up to date ({release['tag_name']})")
+            return result
+
+        result["manifest"] = self._generate_manifest(repo_full_name, release, info["patterns"])
+        return result
+
+    def _is_up_to_date(self, manifest_path: Path, info: Dict, release: Dict) -> bool:
+        entry = self.bucket_index.get(manifest_path.stem)
+        if entry is None:
+            return False
+        if info.get("last_checked") and info["last_checked"] == release.get("published_at"):
+            return True
+        return entry.get("version") == release["tag_name"].lstrip("v")
+
+    def update_manifests(self, jobs: int = 1, force: bool = False, graphql: bool = False,
+                         check_all: bool = False, commit: bool = True, only: Optional[List[str]] = None,
+                         shard: Optional[Tuple[int, int]] = None, shard_output: Optional[Path] = None) -> None:
         if not self.config_path.exists():
             print(f"No config file found at {self.config_path}")
             return
         
-        config = yaml.safe_load(self.config_path.read_text())
+        with self.metrics.phase("config_io"):
+            config = self.config_store.load()
         if not config or "apps" not in config:
             print("No apps configured in tracking file")
             return
 
-        for repo_full_name, info in config["apps"].items():
-            print(f"Checking {repo_full_name}")
-            owner, repo = repo_full_name.split("/")
-            release = self._get_latest_release(owner, repo)
-            
-            if not release:
-                print(f"No release found for {repo_full_name}")
+        apps = list(config["apps"].items())
+        if shard:
+            total = len(apps)
+            apps = [(name, info) for name, info in apps if shard_of(name, shard[1]) == shard[0]]
+            print(f"Shard {shard[0]}/{shard[1]} has {len(apps)} of {total} apps")
+        with self.metrics.phase("index"):
+            reindexed = self.bucket_index.refresh()
+        self.metrics.count("index_reparsed", reindexed)
+        now = datetime.now(timezone.utc)
+        if only is not None:
+            due = [(name, info) for name, info in apps if name in only]
+        elif check_all or force:
+            due = apps
+        else:
+            due = [(name, info) for name, info in apps if is_due(info, now)]
+        if only is None and len(due) < len(apps):
+            print(f"{len(apps) - len(due)} apps are not due for a check yet")
+        if graphql:
+            self._prefetch_releases([repo_full_name for repo_full_name, _ in due])
+
+        self._refresh_rate_limit()
+        scheduled = self._schedule_apps(due, calls_per_app=1 if graphql else 3)
+        if jobs > 1:
+            with ThreadPoolExecutor(max_workers=jobs) as pool:
+                scheduled_results = list(pool.map(lambda app: self._process_app(*app, force=force), scheduled))
+        else:
+            scheduled_results = [self._process_app(*app, force=force) for app in scheduled]
+        results = {repo_full_name: result for (repo_full_name, _), result in zip(scheduled, scheduled_results)}
+
+        # Results are applied in config order regardless of scheduling or
+        # completion order, so writes and the resulting commit stay deterministic.
+        changed_paths: List[Path] = []
+        for repo_full_name, info in apps:
+            result = results.get(repo_full_name)
+            if result is None:
+                continue
+            cadence = result["cadence"] if result["cadence"] is not None else info.get("cadence")
+            info["cadence"] = {**(cadence or {}), "next_check": schedule_next_check(cadence, now)}
+            if result["manifest"] is None:
+                continue
+            manifest_path = result["manifest_path"]
+            errors = validate_manifest(result["manifest"], self.schema_path)
+            if errors:
+                # Leave last_checked alone so the app is retried on the next run.
+                self.metrics.count("invalid_manifests")
+                print(f"Not writing invalid manifest for {manifest_path.stem}: {'; '.join(errors)}")
                 continue
-                
-            manifest = self._generate_manifest(repo_full_name, release, info["patterns"])
-            manifest_path = self.bucket_path / f"{repo}.json"
-            manifest_path.write_text(json.dumps(manifest, indent=4))
-            info["last_checked"] = release["published_at"]
-            print(f"Updated manifest for {repo}")
+            info["last_checked"] = result["release"]["published_at"]
+            self._seed_scoop_cache(manifest_path.stem, result["manifest"])
+            if write_if_changed(manifest_path, canonical_json(result["manifest"])):
+                changed_paths.append(manifest_path)
+                print(f"Updated manifest for {manifest_path.stem}")
+            else:
+                print(f"Manifest for {manifest_path.stem} is unchanged")
+            self.bucket_index.update(manifest_path.stem, result["manifest"], manifest_path)
+
+        for repo_full_name, info in apps:
+            self.bucket_index.set_last_checked(repo_full_name.split("/")[1], info.get("last_checked"))
+        with self.metrics.phase("config_io"):
+            if self.config_store.save(config):
+                changed_paths.append(self.config_path)
+            self.bucket_index.save()
+        self.http_cache.evict()
+        self.hash_cache.evict()
+        if self.artifact_store:
+            self.artifact_store.evict()
+        if shard_output:
+            # Matrix workers hand their results to merge_shards instead of committing.
+            manifest_paths = [path for path in changed_paths if path != self.config_path]
+            write_shard_artifacts(shard_output, manifest_paths, dict(apps))
+            print(f"Wrote {len(manifest_paths)} manifests and {len(apps)} config entries to {shard_output}")
+        elif commit:
+            with self.metrics.phase("git"):
+                self._commit_changes(changed_paths)
+
+    def merge_shards(self, shard_dirs: List[Path], commit: bool = True) -> None:
+        config = self.config_store.load() or {}
+        tracked = config.get("apps") or {}
+        manifests: Dict[str, Path] = {}
+        deltas: Dict[str, Dict] = {}
+        owners: Dict[str, Path] = {}
+        for shard_dir in shard_dirs:
+            manifest_paths, delta = read_shard_artifacts(shard_dir)
+            for key in [path.name for path in manifest_paths] + list(delta):
+                # Shards are disjoint by construction, so an overlap means stale or mixed artifacts.
+                if key in owners:
+                    raise ValueError(f"{key} is in both {owners[key]} and {shard_dir}")
+                owners[key] = shard_dir
+            manifests.update((path.name, path) for path in manifest_paths)
+            deltas.update(delta)
 
-        self.config_path.write_text(yaml.dump(config))
-        self._commit_changes()
+        self.bucket_index.refresh()
+        changed_paths: List[Path] = []
+        rejected = set()
+        for name, path in sorted(manifests.items()):
+            manifest_path = self.bucket_path / name
+            try:
+                manifest = json.loads(path.read_text(encoding="utf-8"))
+                errors = validate_manifest(manifest, self.schema_path)
+            except ValueError as e:
+                errors = [f"Invalid JSON: {e}"]
+            if errors:
+                self.metrics.count("invalid_manifests")
+                print(f"Not merging invalid manifest for {manifest_path.stem}: {'; '.join(errors)}")
+                rejected.add(manifest_path.stem)
+                continue
+            if write_if_changed(manifest_path, canonical_json(manifest)):
+                changed_paths.append(manifest_path)
+            self.bucket_index.update(manifest_path.stem, manifest, manifest_path)
+        # Deltas only carry run state, so apps added to the config meanwhile are left alone.
+        for repo_full_name, values in sorted(deltas.items()):
+            if repo_full_name not in tracked:
+                continue
+            repo = repo_full_name.split("/")[1]
+            if repo in rejected:
+                # Leave last_checked alone so the app is retried on the next run.
+                values = {key: value for key, value in values.items() if key != "last_checked"}
+            tracked[repo_full_name].update(values)
+            self.bucket_index.set_last_checked(repo, tracked[repo_full_name].get("last_checked"))
+        print(f"Merged {len(manifests) - len(rejected)} manifests and {len(deltas)} config entries "
+              f"from {len(shard_dirs)} shards")
+        if self.config_store.save(config):
+            changed_paths.append(self.config_path)
+        self.bucket_index.save()
+        if commit:
+            self._commit_changes(changed_paths)
 
-    def _commit_changes(self) -> None:
+    def _commit_changes(self, paths: List[Path]) -> None:
+        if not paths:
+            print("No changes to commit")
+            return
+        pathspecs = [str(path.relative_to(self.repo_path)) for path in paths]
         try:
             status = subprocess.run(
-                ["git", "status", "--porcelain"],
+                ["git", "status", "--porcelain", "--untracked-files=all", "--", *pathspecs],
                 cwd=self.repo_path,
                 capture_output=True,
                 text=True
             )
             if status.stdout.strip():
-                subprocess.run(["git", "add", "."], cwd=self.repo_path, check=True)
+                subprocess.run(["git", "add", "--", *pathspecs], cwd=self.repo_path, check=True)
                 subprocess.run(
-                    ["git", "commit", "-m", f"Updated manifests {datetime.now().isoformat()}"],
+                    ["git", "commit", "-m", f"Updated manifests {datetime.now().isoformat()}", "--", *pathspecs],
                     cwd=self.repo_path,
                     check=True
                 )
@@ -192,4 +566,76 @@ class TrebleScoopUpdater:
             print(f"Git operation failed: {e}")
             print(f"Command output: {e.output if hasattr(e, 'output') else 'No output'}")
         except Exception as e:
-            print(f"Error during git operations: {e}")
\ No newline at end of file
+            print(f"Error during git operations: {e}")
+
+
+def _read_token(required: bool = True) -> str:
+    token = os.environ.get("GITHUB_TOKEN")
+    if token:
+        return token
+    token_path = Path.home().joinpath(".github_token")
+    if not required and not token_path.exists():
+        return ""
+    return token_path.read_text().strip()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Update TrebleScoop manifests from GitHub releases")
+    parser.add_argument("--repo-path", type=Path, default=Path(__file__).resolve().parent.parent)
+    parser.add_argument("--jobs", "-j", type=int, default=1, help="number of apps to check in parallel")
+    parser.add_argument("--graphql", action="store_true", help="fetch releases and licenses in batched GraphQL queries")
+    parser.add_argument("--api-url", default="https://api.github.com", help="GitHub API base URL")
+    parser.add_argument("--verify", action="store_true", help="re-download and re-hash assets instead of trusting the hash cache")
+    parser.add_argument("--force", action="store_true", help="regenerate manifests even if the release has not changed")
+    parser.add_argument("--artifact-store", type=Path, help="directory for a local content-addressed copy of downloaded assets")
+    parser.add_argument("--artifact-store-max-gb", type=float, default=10, help="size cap for the artifact store")
+    parser.add_argument("--scoop-cache", type=Path, help="Scoop cache directory to seed from the artifact store")
+    parser.add_argument("--no-commit", action="store_true", help="write manifests without committing or pushing")
+    parser.add_argument("--metrics-json", type=Path, help="write a per-app, per-phase timing report to this file")
+    parser.add_argument("--metrics-prom", type=Path, help="write run metrics as a Prometheus textfile")
+    parser.add_argument("--check-all", action="store_true", help="check every app, ignoring learned polling intervals")
+    cassette_mode = parser.add_mutually_exclusive_group()
+    cassette_mode.add_argument("--record", type=Path, metavar="DIR", help="record every HTTP exchange into a cassette")
+    cassette_mode.add_argument("--replay", type=Path, metavar="DIR", help="serve HTTP from a recorded cassette, without network")
+    parser.add_argument("--shard", type=parse_shard, metavar="I/N", help="only update apps in shard I of N")
+    parser.add_argument("--shard-output", type=Path, metavar="DIR", help="where a shard writes its manifests and config delta")
+    parser.add_argument("--merge-shards", type=Path, nargs="+", metavar="DIR", help="merge shard outputs into one commit")
+    parser.add_argument("--cassette-content", action="store_true", help="store large asset bodies in the cassette, not just digests")
+    args = parser.parse_args(argv)
+    if args.shard and not args.shard_output:
+        parser.error("--shard needs --shard-output")
+
+    artifact_store = None
+    if args.artifact_store:
+        artifact_store = ArtifactStore(args.artifact_store, max_bytes=int(args.artifact_store_max_gb * 1024 ** 3))
+    cassette = session = None
+    if args.record or args.replay:
+        cassette = Cassette(args.record or args.replay, RECORD if args.record else REPLAY, args.cassette_content)
+        session = PooledSession()
+        cassette.mount(session)
+    token = "replay" if args.replay else _read_token()
+    updater = TrebleScoopUpdater(args.repo_path, token, verify=args.verify, api_url=args.api_url, session=session,
+                                 artifact_store=artifact_store, scoop_cache_dir=args.scoop_cache, cassette=cassette)
+    if args.merge_shards:
+        try:
+            updater.merge_shards(args.merge_shards, commit=not args.no_commit)
+        except ValueError as e:
+            print(f"Cannot merge shards: {e}")
+            return 1
+        return 0
+    try:
+        updater.update_manifests(jobs=max(1, args.jobs), force=args.force, graphql=args.graphql,
+                                 check_all=args.check_all, commit=not args.no_commit,
+                                 shard=args.shard, shard_output=args.shard_output)
+    finally:
+        if cassette:
+            cassette.save()
+    if args.metrics_json:
+        updater.metrics.write_json(args.metrics_json)
+    if args.metrics_prom:
+        updater.metrics.write_prometheus(args.metrics_prom)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
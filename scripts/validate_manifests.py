@@ -0,0 +1,154 @@
+from pathlib import Path
+import argparse
+import functools
+import json
+import os
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+from manifest_io import canonical_json, write_if_changed
+
+try:
+    import jsonschema
+except ImportError:
+    jsonschema = None
+
+ARCHITECTURES = ("32bit", "64bit", "arm64")
+
+
+def default_schema_path() -> Optional[Path]:
+    candidates = []
+    if os.environ.get("SCOOP_HOME"):
+        candidates.append(Path(os.environ["SCOOP_HOME"]) / "schema.json")
+    candidates.append(Path.home() / "scoop" / "apps" / "scoop" / "current" / "schema.json")
+    return next((path for path in candidates if path.exists()), None)
+
+
+@functools.lru_cache(maxsize=None)
+def _schema_validator(schema_path: Optional[str]):
+    # Built once per process: parsing the schema and checking it against its
+    # metaschema costs more than validating a single manifest.
+    if jsonschema is None or schema_path is None:
+        return None
+    schema = json.loads(Path(schema_path).read_text(encoding="utf-8"))
+    validator_class = jsonschema.validators.validator_for(schema)
+    validator_class.check_schema(schema)
+    return validator_class(schema)
+
+
+def _basic_errors(manifest: Dict) -> List[str]:
+    errors = []
+    if not isinstance(manifest, dict):
+        return ["manifest must be a JSON object"]
+    if not isinstance(manifest.get("version"), str) or not manifest["version"]:
+        errors.append("version: required non-empty string")
+    if not isinstance(manifest.get("homepage"), str):
+        errors.append("homepage: required string")
+    scopes = [("", manifest)] + [(f"architecture.{arch}.", scope)
+                                 for arch, scope in (manifest.get("architecture") or {}).items()]
+    for arch in manifest.get("architecture") or {}:
+        if arch not in ARCHITECTURES:
+            errors.append(f"architecture.{arch}: unknown architecture")
+    for prefix, scope in scopes:
+        if not isinstance(scope, dict):
+            errors.append(f"{prefix.rstrip('.')}: must be an object")
+            continue
+        urls, hashes = scope.get("url"), scope.get("hash")
+        if urls is not None and hashes is not None:
+            url_count = len(urls) if isinstance(urls, list) else 1
+            hash_count = len(hashes) if isinstance(hashes, list) else 1
+            if url_count != hash_count:
+                errors.append(f"{prefix}hash: {hash_count} hashes for {url_count} urls")
+    if "autoupdate" in manifest and "checkver" not in manifest:
+        errors.append("autoupdate: requires checkver")
+    return errors
+
+
+def validate_manifest(manifest: Dict, schema_path: Optional[Path] = None) -> List[str]:
+    validator = _schema_validator(str(schema_path) if schema_path else None)
+    if validator is None:
+        return _basic_errors(manifest)
+    return [
+        f"{'.'.join(str(part) for part in error.absolute_path) or '<root>'}: {error.message}"
+        for error in sorted(validator.iter_errors(manifest), key=lambda error: list(error.absolute_path))
+    ]
+
+
+def check_file(path: Path, schema_path: Optional[Path] = None, fix: bool = False) -> Dict:
+    result = {"app": path.stem, "path": str(path), "errors": [], "formatted": True}
+    text = path.read_bytes().decode("utf-8-sig")
+    try:
+        manifest = json.loads(text)
+    except ValueError as e:
+        result["errors"].append(f"Invalid JSON: {e}")
+        result["formatted"] = False
+        return result
+    result["errors"] = validate_manifest(manifest, schema_path)
+    canonical = canonical_json(manifest)
+    # Line endings are up to git; everything else, final newline included, must match.
+    result["formatted"] = text.replace("\r\n", "\n") == canonical
+    if fix and not result["formatted"]:
+        write_if_changed(path, canonical)
+        result["formatted"] = True
+    return result
+
+
+def changed_manifests(repo_path: Path, since: str) -> List[Path]:
+    pathspec = "bucket/*.json"
+    changed = subprocess.run(
+        ["git", "diff", "--name-only", "--diff-filter=ACMR", since, "--", pathspec],
+        cwd=repo_path, capture_output=True, text=True, check=True
+    ).stdout.splitlines()
+    untracked = subprocess.run(
+        ["git", "ls-files", "--others", "--exclude-standard", "--", pathspec],
+        cwd=repo_path, capture_output=True, text=True, check=True
+    ).stdout.splitlines()
+    return sorted({repo_path / name for name in changed + untracked})
+
+
+def run(paths: List[Path], schema_path: Optional[Path] = None, fix: bool = False, jobs: int = 1) -> List[Dict]:
+    if jobs <= 1 or len(paths) < 2:
+        return [check_file(path, schema_path, fix) for path in paths]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        chunksize = max(1, len(paths) // (jobs * 4))
+        return list(pool.map(check_file, paths, [schema_path] * len(paths), [fix] * len(paths), chunksize=chunksize))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Validate manifest schema and formatting")
+    parser.add_argument("apps", nargs="*", help="manifest names to check (default: the whole bucket)")
+    parser.add_argument("--repo-path", type=Path, default=Path(__file__).resolve().parent.parent)
+    parser.add_argument("--since", help="only check manifests changed since this git ref")
+    parser.add_argument("--schema", type=Path, default=default_schema_path(), help="Scoop schema.json (needs jsonschema)")
+    parser.add_argument("--fix", action="store_true", help="rewrite badly formatted manifests in canonical form")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    bucket = args.repo_path / "bucket"
+    if args.apps:
+        paths = [bucket / f"{app}.json" for app in args.apps]
+    elif args.since:
+        paths = changed_manifests(args.repo_path, args.since)
+    else:
+        paths = sorted(bucket.glob("*.json"))
+    if args.schema and jsonschema is None:
+        print("jsonschema is not installed; falling back to basic checks", file=sys.stderr)
+    results = run(paths, args.schema, fix=args.fix, jobs=max(1, args.jobs))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for result in results:
+            for error in result["errors"]:
+                print(f"{result['app']}: {error}")
+            if not result["formatted"]:
+                print(f"{result['app']}: not in canonical format")
+        print(f"Checked {len(results)} manifests")
+    return 1 if any(result["errors"] or not result["formatted"] for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+from pathlib import Path
+import argparse
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import requests
+
+from artifact_store import ArtifactStore
+from treble_scoop_updater import TrebleScoopUpdater, _read_token, probe_hash_key, probe_url
+
+
+def _as_list(value) -> List:
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def manifest_entries(app: str, manifest: Dict) -> List[Dict]:
+    entries = []
+    scopes = [(None, manifest)] + list(manifest.get("architecture", {}).items())
+    for arch, scope in scopes:
+        urls, hashes = _as_list(scope.get("url")), _as_list(scope.get("hash"))
+        for i, url in enumerate(urls):
+            entries.append({
+                "app": app,
+                "architecture": arch,
+                "url": url,
+                "expected_hash": hashes[i] if i < len(hashes) else None
+            })
+    return entries
+
+
+def _split_hash(value: str):
+    algorithm, _, digest = value.rpartition(":")
+    return (algorithm or "sha256").lower(), digest.lower()
+
+
+class ManifestVerifier:
+    def __init__(self, updater: TrebleScoopUpdater, check_hashes: bool = False):
+        self.updater = updater
+        self.session = updater.session
+        self.check_hashes = check_hashes
+
+    def check_url(self, url: str) -> requests.Response:
+        return probe_url(self.session, url)
+
+    def actual_hashes(self, url: str, algorithms: List[str], head: requests.Response) -> Dict[str, str]:
+        # Keyed like the updater's HEAD-probed URLs; release assets it hashed through
+        # the API use asset metadata instead and are not shared with this cache entry.
+        # Misses go through _download_hashes, which reads the artifact store first
+        # and hashes a stored blob locally when other algorithms are needed.
+        key = probe_hash_key(url, head)
+        cached = self.updater.hash_cache.get(*key) if key and not self.updater.verify else None
+        if cached and set(algorithms) <= {"sha256"}:
+            return {"sha256": cached}
+        digests = self.updater._download_hashes(url, key[1:] if key else (), algorithms=algorithms)
+        if key:
+            self.updater.hash_cache.put(*key, digests["sha256"])
+        return digests
+
+    def verify_url(self, url: str, entries: List[Dict]) -> List[Dict]:
+        # Entries sharing a URL (e.g. one asset under several architectures) share one
+        # probe and one download, which yields every digest algorithm they ask for.
+        results = [dict(entry) for entry in entries]
+        try:
+            head = self.check_url(url)
+        except requests.RequestException as e:
+            for result in results:
+                result.update(status_code=None, url_ok=False, error=str(e))
+            return results
+        url_ok = head.status_code in (200, 206)
+        for result in results:
+            result.update(status_code=head.status_code, url_ok=url_ok)
+        expected = [(result, *_split_hash(result["expected_hash"])) for result in results if result["expected_hash"]]
+        if not (self.check_hashes and url_ok and expected):
+            return results
+        try:
+            digests = self.actual_hashes(url, sorted({algorithm for _, algorithm, _ in expected}), head)
+        except (requests.RequestException, ValueError) as e:
+            for result, _, _ in expected:
+                result.update(hash_ok=False, error=str(e))
+            return results
+        for result, algorithm, digest in expected:
+            result.update(actual_hash=digests[algorithm], hash_ok=digests[algorithm] == digest)
+        return results
+
+    def run(self, manifest_paths: List[Path], jobs: int = 16) -> Dict:
+        entries, errors = [], []
+        for path in manifest_paths:
+            try:
+                manifest = json.loads(path.read_text(encoding="utf-8"))
+            except ValueError as e:
+                errors.append({"app": path.stem, "error": f"Invalid JSON: {e}"})
+                continue
+            entries.extend(manifest_entries(path.stem, manifest))
+
+        by_url: Dict[str, List[Dict]] = {}
+        for entry in entries:
+            by_url.setdefault(entry["url"].split("#")[0], []).append(entry)
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            results = [result for url_results in pool.map(lambda item: self.verify_url(*item), by_url.items())
+                       for result in url_results]
+        failed = [r for r in results if not r["url_ok"] or r.get("hash_ok") is False]
+        return {
+            "checked": len(results),
+            "failed": len(failed) + len(errors),
+            "manifest_errors": errors,
+            "results": results
+        }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Check that manifest URLs are reachable and hashes match")
+    parser.add_argument("apps", nargs="*", help="manifest names to check (default: the whole bucket)")
+    parser.add_argument("--repo-path", type=Path, default=Path(__file__).resolve().parent.parent)
+    parser.add_argument("--hashes", action="store_true", help="also download (or reuse cached) assets and compare hashes")
+    parser.add_argument("--verify", action="store_true", help="ignore cached hashes and re-download")
+    parser.add_argument("--artifact-store", type=Path, help="content-addressed asset store to read from and fill")
+    parser.add_argument("--artifact-store-max-gb", type=float, default=10, help="size cap for the artifact store")
+    parser.add_argument("--jobs", "-j", type=int, default=16)
+    parser.add_argument("--output", "-o", type=Path, help="write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    # Verification makes no API calls, so a token is optional.
+    artifact_store = None
+    if args.artifact_store:
+        artifact_store = ArtifactStore(args.artifact_store, max_bytes=int(args.artifact_store_max_gb * 1024 ** 3))
+    updater = TrebleScoopUpdater(args.repo_path, _read_token(required=False), verify=args.verify,
+                                 artifact_store=artifact_store)
+    bucket = args.repo_path / "bucket"
+    paths = [bucket / f"{app}.json" for app in args.apps] if args.apps else sorted(bucket.glob("*.json"))
+    report = ManifestVerifier(updater, check_hashes=args.hashes).run(paths, jobs=max(1, args.jobs))
+    updater.hash_cache.evict()
+    if artifact_store:
+        artifact_store.evict()
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(output)
+    else:
+        print(output)
+    return 1 if report["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
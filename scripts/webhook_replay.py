@@ -0,0 +1,48 @@
+from pathlib import Path
+import argparse
+import json
+import os
+import sys
+from typing import List, Optional
+
+import requests
+
+from webhook_service import sign
+
+
+def load_delivery(path: Path, default_event: str):
+    # Accepts a bare payload or a recorded delivery: {"event": ..., "payload": {...}}.
+    data = json.loads(path.read_text(encoding="utf-8"))
+    if "payload" in data and "event" in data:
+        return data["event"], data["payload"]
+    return default_event, data
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="POST recorded GitHub webhook payloads to a local webhook service")
+    parser.add_argument("payloads", nargs="+", type=Path, help="recorded payload files")
+    parser.add_argument("--url", default="http://127.0.0.1:8080/", help="webhook service URL")
+    parser.add_argument("--event", default="release", help="event name for bare payload files")
+    parser.add_argument("--secret", default=os.environ.get("GITHUB_WEBHOOK_SECRET"), help="HMAC secret (default: GITHUB_WEBHOOK_SECRET)")
+    args = parser.parse_args(argv)
+
+    if not args.secret:
+        print("A secret is required to sign payloads")
+        return 2
+    failures = 0
+    with requests.Session() as session:
+        for path in args.payloads:
+            event, payload = load_delivery(path, args.event)
+            body = json.dumps(payload).encode()
+            resp = session.post(args.url, data=body, headers={
+                "Content-Type": "application/json",
+                "X-GitHub-Event": event,
+                "X-Hub-Signature-256": sign(args.secret.encode(), body)
+            })
+            print(f"{path.name}: {resp.status_code} {resp.text.strip()}")
+            failures += resp.status_code >= 400
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,181 @@
+from pathlib import Path
+import argparse
+import asyncio
+import hashlib
+import hmac
+import json
+import os
+import sys
+from typing import Dict, List, Optional, Tuple
+
+from metrics import RunMetrics
+from treble_scoop_updater import TrebleScoopUpdater, _read_token
+
+MAX_BODY_BYTES = 25 * 1024 * 1024
+RELEASE_ACTIONS = ("published", "released")
+REASONS = {200: "OK", 202: "Accepted", 400: "Bad Request", 401: "Unauthorized",
+           405: "Method Not Allowed", 413: "Payload Too Large"}
+
+
+def sign(secret: bytes, body: bytes) -> str:
+    return "sha256=" + hmac.new(secret, body, hashlib.sha256).hexdigest()
+
+
+def verify_signature(secret: bytes, body: bytes, header: Optional[str]) -> bool:
+    return bool(header) and hmac.compare_digest(sign(secret, body), header)
+
+
+class WebhookService:
+    def __init__(self, updater: TrebleScoopUpdater, secret: bytes, batch_delay: float = 30,
+                 poll_interval: float = 24 * 3600, jobs: int = 4, commit: bool = True):
+        self.updater = updater
+        self.secret = secret
+        self.batch_delay = batch_delay
+        self.poll_interval = poll_interval
+        self.jobs = jobs
+        self.commit = commit
+        self._pending: Dict[str, Dict] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._run_lock = asyncio.Lock()
+        self.last_report: Optional[Dict] = None
+
+    def _tracked_name(self, full_name: str) -> Optional[str]:
+        # GitHub may report a different case than tracked_apps.yml uses.
+        config = self.updater.config_store.load() or {}
+        tracked = {name.lower(): name for name in (config.get("apps") or {})}
+        return tracked.get(full_name.lower())
+
+    def handle_event(self, event: str, payload: Dict) -> Tuple[int, str]:
+        if event == "ping":
+            return 200, "pong"
+        if event != "release":
+            return 202, f"ignored {event} event"
+        release = payload.get("release") or {}
+        if payload.get("action") not in RELEASE_ACTIONS or release.get("draft") or release.get("prerelease"):
+            return 202, f"ignored {payload.get('action')} release"
+        repository = payload.get("repository") or {}
+        name = self._tracked_name(repository.get("full_name", ""))
+        if name is None:
+            # Any 4xx counts as a failed delivery on GitHub's side and can get the hook disabled.
+            return 202, f"ignored untracked {repository.get('full_name')}"
+        # The payload carries the same release object the REST API returns, so
+        # the regeneration needs no extra round trip for it or the license.
+        self._pending[name] = {"release": release,
+                               "license": (repository.get("license") or {}).get("spdx_id")}
+        if self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(
+                self.batch_delay, lambda: asyncio.ensure_future(self.flush()))
+        print(f"Queued {name} {release.get('tag_name')}")
+        return 202, f"queued {name}"
+
+    async def flush(self) -> None:
+        self._flush_handle = None
+        pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        print(f"Regenerating {len(pending)} apps: {', '.join(sorted(pending))}")
+        await self._run(list(pending), pending)
+
+    async def poll(self) -> None:
+        await self._run(None, {})
+
+    async def _run(self, only: Optional[List[str]], prefetched: Dict[str, Dict]) -> None:
+        def work() -> None:
+            self.updater._prefetched = prefetched
+            # The daemon reuses one updater, so give every coalesced run its own counters.
+            self.updater.metrics = RunMetrics()
+            try:
+                self.updater.update_manifests(jobs=self.jobs, only=only, commit=self.commit)
+            finally:
+                self.updater._prefetched = {}
+                self.last_report = self.updater.metrics.report()
+
+        async with self._run_lock:
+            try:
+                await asyncio.get_running_loop().run_in_executor(None, work)
+            except Exception as e:
+                print(f"Update run failed: {e}")
+
+    async def _poll_forever(self) -> None:
+        while True:
+            await self.poll()
+            await asyncio.sleep(self.poll_interval)
+
+    async def _respond(self, writer: asyncio.StreamWriter, status: int, message: str) -> None:
+        body = json.dumps({"message": message}).encode()
+        writer.write(
+            f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body
+        )
+        await writer.drain()
+        writer.close()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request_line = (await reader.readline()).decode("latin-1").split()
+            headers = {}
+            while True:
+                line = (await reader.readline()).decode("latin-1").strip()
+                if not line:
+                    break
+                key, _, value = line.partition(":")
+                headers[key.strip().lower()] = value.strip()
+            if len(request_line) < 2 or request_line[0] != "POST":
+                return await self._respond(writer, 405, "only POST is supported")
+            length = int(headers.get("content-length", 0))
+            if length > MAX_BODY_BYTES:
+                return await self._respond(writer, 413, "payload too large")
+            body = await reader.readexactly(length)
+            if not verify_signature(self.secret, body, headers.get("x-hub-signature-256")):
+                return await self._respond(writer, 401, "bad signature")
+            try:
+                payload = json.loads(body)
+            except ValueError:
+                return await self._respond(writer, 400, "invalid JSON")
+            status, message = self.handle_event(headers.get("x-github-event", ""), payload)
+            await self._respond(writer, status, message)
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            writer.close()
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8080) -> None:
+        server = await asyncio.start_server(self._handle_connection, host, port)
+        print(f"Listening for GitHub webhooks on {host}:{port}")
+        poller = asyncio.ensure_future(self._poll_forever())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            poller.cancel()
+            if self._flush_handle is not None:
+                self._flush_handle.cancel()
+            await self.flush()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Regenerate manifests from GitHub release webhooks")
+    parser.add_argument("--repo-path", type=Path, default=Path(__file__).resolve().parent.parent)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--batch-delay", type=float, default=30, help="seconds to collect events before regenerating")
+    parser.add_argument("--poll-hours", type=float, default=24, help="interval of the fallback polling run")
+    parser.add_argument("--jobs", "-j", type=int, default=4)
+    parser.add_argument("--api-url", default="https://api.github.com", help="GitHub API base URL")
+    parser.add_argument("--no-commit", action="store_true", help="write manifests without committing or pushing")
+    args = parser.parse_args(argv)
+
+    secret = os.environ.get("GITHUB_WEBHOOK_SECRET")
+    if not secret:
+        print("GITHUB_WEBHOOK_SECRET must be set")
+        return 2
+    updater = TrebleScoopUpdater(args.repo_path, _read_token(), api_url=args.api_url)
+    service = WebhookService(updater, secret.encode(), batch_delay=args.batch_delay,
+                             poll_interval=args.poll_hours * 3600, jobs=max(1, args.jobs), commit=not args.no_commit)
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+import struct
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+EOCD_SIGNATURE = b"PK\x05\x06"
+ZIP64_LOCATOR_SIGNATURE = b"PK\x06\x07"
+ZIP64_EOCD_SIGNATURE = b"PK\x06\x06"
+CENTRAL_DIR_SIGNATURE = b"PK\x01\x02"
+EOCD_STRUCT = struct.Struct("<4s4H2LH")
+ZIP64_LOCATOR_STRUCT = struct.Struct("<4sLQL")
+ZIP64_EOCD_STRUCT = struct.Struct("<4sQ2H2L4Q")
+CENTRAL_DIR_STRUCT = struct.Struct("<4s6H3L5H2L")
+# EOCD record plus the largest possible archive comment.
+TAIL_SIZE = EOCD_STRUCT.size + 0xFFFF
+
+
+class ZipInspectError(Exception):
+    pass
+
+
+def _fetch_range(session: requests.Session, url: str, byte_range: str) -> Tuple[bytes, int, int]:
+    resp = session.get(url, headers={"Range": f"bytes={byte_range}", "Accept-Encoding": "identity"})
+    if resp.status_code != 206:
+        raise ZipInspectError(f"Server did not honour range request for {url} (status {resp.status_code})")
+    # Content-Range: bytes <start>-<end>/<total>
+    span, _, total = resp.headers.get("Content-Range", "").partition("/")
+    start = int(span.split()[-1].split("-")[0])
+    return resp.content, start, int(total)
+
+
+def _parse_central_directory(data: bytes, count: int) -> List[Tuple[str, int]]:
+    members = []
+    pos = 0
+    for _ in range(count):
+        fields = CENTRAL_DIR_STRUCT.unpack_from(data, pos)
+        if fields[0] != CENTRAL_DIR_SIGNATURE:
+            raise ZipInspectError("Corrupt central directory entry")
+        flags, size = fields[3], fields[9]
+        name_len, extra_len, comment_len = fields[10], fields[11], fields[12]
+        name_start = pos + CENTRAL_DIR_STRUCT.size
+        raw_name = data[name_start:name_start + name_len]
+        name = raw_name.decode("utf-8" if flags & 0x800 else "cp437")
+        if size == 0xFFFFFFFF:
+            extra = data[name_start + name_len:name_start + name_len + extra_len]
+            size = _zip64_size(extra)
+        members.append((name, size))
+        pos = name_start + name_len + extra_len + comment_len
+    return members
+
+
+def _zip64_size(extra: bytes) -> int:
+    pos = 0
+    while pos + 4 <= len(extra):
+        header_id, length = struct.unpack_from("<2H", extra, pos)
+        if header_id == 0x0001:
+            return struct.unpack_from("<Q", extra, pos + 4)[0]
+        pos += 4 + length
+    raise ZipInspectError("Missing zip64 size field")
+
+
+def list_zip_members(session: requests.Session, url: str) -> List[Tuple[str, int]]:
+    tail, tail_start, total = _fetch_range(session, url, f"-{TAIL_SIZE}")
+    eocd_pos = tail.rfind(EOCD_SIGNATURE)
+    if eocd_pos < 0:
+        raise ZipInspectError(f"No end of central directory record in {url}")
+    _, _, _, _, count, cd_size, cd_offset, _ = EOCD_STRUCT.unpack_from(tail, eocd_pos)
+
+    if cd_offset == 0xFFFFFFFF or count == 0xFFFF:
+        locator_pos = eocd_pos - ZIP64_LOCATOR_STRUCT.size
+        signature, _, zip64_eocd_offset, _ = ZIP64_LOCATOR_STRUCT.unpack_from(tail, locator_pos)
+        if signature != ZIP64_LOCATOR_SIGNATURE:
+            raise ZipInspectError(f"Missing zip64 locator in {url}")
+        if zip64_eocd_offset >= tail_start:
+            record = tail[zip64_eocd_offset - tail_start:]
+        else:
+            record, _, _ = _fetch_range(session, url, f"{zip64_eocd_offset}-{zip64_eocd_offset + ZIP64_EOCD_STRUCT.size - 1}")
+        fields = ZIP64_EOCD_STRUCT.unpack_from(record)
+        if fields[0] != ZIP64_EOCD_SIGNATURE:
+            raise ZipInspectError(f"Corrupt zip64 end of central directory in {url}")
+        count, cd_size, cd_offset = fields[7], fields[8], fields[9]
+
+    if cd_offset >= tail_start:
+        central_dir = tail[cd_offset - tail_start:cd_offset - tail_start + cd_size]
+    else:
+        central_dir, _, _ = _fetch_range(session, url, f"{cd_offset}-{cd_offset + cd_size - 1}")
+    return _parse_central_directory(central_dir, count)
+
+
+def detect_layout(members: List[Tuple[str, int]], app_name: str) -> Dict:
+    files = [name for name, _ in members if not name.endswith("/")]
+    if not files:
+        return {}
+
+    layout = {}
+    prefix = ""
+    roots = {name.split("/", 1)[0] for name in files}
+    if len(roots) == 1 and all("/" in name for name in files):
+        layout["extract_dir"] = roots.pop()
+        prefix = layout["extract_dir"] + "/"
+
+    executables = [name[len(prefix):] for name in files
+                   if name.lower().endswith(".exe") and "/" not in name[len(prefix):]]
+    preferred = [exe for exe in executables if exe.lower().startswith(app_name.lower())]
+    candidates = preferred or executables
+    if len(candidates) == 1:
+        layout["bin"] = candidates[0]
+    return layout
+
+
+def inspect_zip(session: requests.Session, url: str, app_name: str) -> Optional[Dict]:
+    try:
+        return detect_layout(list_zip_members(session, url), app_name)
+    except (ZipInspectError, struct.error, ValueError, requests.RequestException) as e:
+        print(f"Could not inspect {url}: {e}")
+        return None
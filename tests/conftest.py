@@ -0,0 +1,28 @@
+from pathlib import Path
+import sys
+
+import pytest
+import yaml
+
+SCRIPTS = Path(__file__).resolve().parent.parent / "scripts"
+sys.path.insert(0, str(SCRIPTS))
+
+from github_standin import GitHubStandIn  # noqa: E402
+
+
+@pytest.fixture
+def standin():
+    server = GitHubStandIn().start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def bucket_repo(tmp_path):
+    def seed(*repos: str) -> Path:
+        (tmp_path / "bucket").mkdir(exist_ok=True)
+        (tmp_path / "scripts").mkdir(exist_ok=True)
+        config = {"apps": {repo: {"patterns": {"64bit": "windows_amd64.zip"}, "last_checked": None} for repo in repos}}
+        (tmp_path / "scripts" / "tracked_apps.yml").write_text(yaml.dump(config))
+        return tmp_path
+    return seed
@@ -0,0 +1,52 @@
+import json
+
+import pytest
+import requests
+
+from cassette import RECORD, REPLAY, Cassette, CassetteMiss
+from github_standin import GitHubStandIn
+from http_session import PooledSession
+from treble_scoop_updater import TrebleScoopUpdater
+
+
+def run_updater(repo_path, api_url, cassette):
+    session = PooledSession()
+    cassette.mount(session)
+    TrebleScoopUpdater(repo_path, "token", api_url=api_url, session=session,
+                       cassette=cassette).update_manifests(check_all=True, commit=False)
+    cassette.save()
+    return json.loads((repo_path / "bucket" / "app.json").read_text())
+
+
+@pytest.mark.parametrize("store_content", [False, True])
+def test_record_then_replay_without_network(bucket_repo, tmp_path, store_content):
+    standin = GitHubStandIn().start()
+    cassette_path = tmp_path / "cassette"
+    try:
+        recorded = run_updater(bucket_repo("owner/app"), standin.url, Cassette(cassette_path, RECORD, store_content))
+    finally:
+        standin.stop()
+    assert (cassette_path / "bodies").exists() == store_content
+
+    replay_repo = tmp_path / "replay"
+    replay_repo.mkdir()
+    (replay_repo / "scripts").mkdir()
+    (replay_repo / "bucket").mkdir()
+    (replay_repo / "scripts" / "tracked_apps.yml").write_bytes((tmp_path / "scripts" / "tracked_apps.yml").read_bytes())
+    # The stand-in is gone, so every response has to come from the cassette.
+    assert run_updater(replay_repo, standin.url, Cassette(cassette_path, REPLAY)) == recorded
+
+
+def test_replay_miss_is_a_connection_error(standin, tmp_path):
+    cassette = Cassette(tmp_path, RECORD)
+    with requests.Session() as session:
+        cassette.mount(session)
+        session.get(f"{standin.url}/repos/o/r")
+    cassette.save()
+
+    replay = Cassette(tmp_path, REPLAY)
+    with requests.Session() as session:
+        replay.mount(session)
+        assert session.get(f"{standin.url}/repos/o/r").json()["license"]["spdx_id"] == "MIT"
+        with pytest.raises(CassetteMiss):
+            session.get(f"{standin.url}/repos/o/other")
@@ -0,0 +1,84 @@
+import hashlib
+import json
+
+import pytest
+
+import checkver
+from checkver import CheckverEngine
+from http_session import PooledSession
+from manifest_io import canonical_json
+from treble_scoop_updater import TrebleScoopUpdater
+
+
+def seed(repo_path, standin):
+    bucket = repo_path / "bucket"
+    bucket.mkdir(parents=True)
+    (repo_path / "scripts").mkdir()
+    (bucket / "app.json").write_text(canonical_json({
+        "version": "0.9.0",
+        "homepage": "https://github.com/o/app",
+        "url": f"{standin.url}/assets/o/app/app_0.9.0_windows_amd64.zip",
+        "hash": "0" * 64,
+        "checkver": {"github": "https://github.com/o/app"},
+        "autoupdate": {"url": f"{standin.url}/assets/o/app/app_$version_windows_amd64.zip"}
+    }))
+    (bucket / "current.json").write_text(canonical_json({
+        "version": "1.0.0", "homepage": "https://github.com/o/current", "checkver": "github"}))
+    # No checkver, so the index entry alone marks it as skipped.
+    (bucket / "manual.json").write_text(canonical_json({"version": "2.0", "homepage": "https://example.com"}))
+    return sorted(bucket.glob("*.json"))
+
+
+def test_update_keeps_index_current(standin, tmp_path):
+    paths = seed(tmp_path, standin)
+    updater = TrebleScoopUpdater(tmp_path, "token", api_url=standin.url, session=PooledSession())
+    engine = CheckverEngine(updater)
+
+    results = {result["app"]: result for result in engine.run(paths)}
+    assert {app: result["status"] for app, result in results.items()} == {
+        "app": "outdated", "current": "up to date", "manual": "skipped"}
+    assert engine.outdated(list(results.values())) == ["app"]
+
+    results = engine.run(paths, update=True)
+    assert json.loads(paths[0].read_text())["version"] == "1.0.0"
+    assert updater.bucket_index.get("app")["version"] == "1.0.0"
+    assert engine.outdated(results) == []
+
+
+def test_outdated_flag_lists_only_apps_behind(standin, tmp_path, monkeypatch, capsys):
+    seed(tmp_path, standin)
+    monkeypatch.setenv("GITHUB_TOKEN", "token")
+
+    assert checkver.main(["--repo-path", str(tmp_path), "--api-url", standin.url, "--outdated", "--json"]) == 0
+    assert [result["app"] for result in json.loads(capsys.readouterr().out)] == ["app"]
+
+
+@pytest.mark.parametrize("name, text, published", [
+    ("SHA256SUMS", "{other}  other.zip\n{hash}  app.zip\n", True),
+    ("SHA256SUMS", "{other}  other.zip\n{third}  third.zip\n", False),
+    ("SHA256SUMS", "{other}  other.zip\n", False),
+    ("app.zip.sha256", "{hash}\n", True),
+    ("app.zip.sha512", "{hash}\n", False),
+])
+def test_autoupdate_hash_only_uses_this_files_entry(standin, tmp_path, name, text, published):
+    listed = "a" * 64
+    standin.files[name] = text.format(hash=listed, other="1" * 64, third="2" * 64).encode()
+    engine = CheckverEngine(TrebleScoopUpdater(tmp_path, "", api_url=standin.url, session=PooledSession()))
+    url = f"{standin.url}/assets/o/app/app.zip"
+
+    digest = engine._autoupdate_hash({"url": f"{standin.url}/files/{name}"}, url, {}, None)
+    assert digest == (listed if published else hashlib.sha256(standin.asset).hexdigest())
+    assert standin.stats["asset_downloads"] == (0 if published else 1)
+
+
+def test_url_checkver_needs_no_token(standin, tmp_path, monkeypatch, capsys):
+    monkeypatch.delenv("GITHUB_TOKEN", raising=False)
+    monkeypatch.setenv("HOME", str(tmp_path))
+    standin.files["download.html"] = b"<a href='/get/tool-2.1.0.zip'>Download</a>"
+    (tmp_path / "bucket").mkdir()
+    (tmp_path / "bucket" / "tool.json").write_text(canonical_json({
+        "version": "2.0.0", "homepage": "https://example.com",
+        "checkver": {"url": f"{standin.url}/files/download.html", "regex": "tool-([\\d.]+)\\.zip"}}))
+
+    assert checkver.main(["--repo-path", str(tmp_path), "--api-url", standin.url]) == 0
+    assert "tool: outdated (2.0.0 -> 2.1.0)" in capsys.readouterr().out
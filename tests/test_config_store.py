@@ -0,0 +1,21 @@
+import json
+import pickle
+
+from config_store import ConfigStore
+
+
+def test_snapshot_is_json_and_reused(tmp_path):
+    config_path, snapshot_path = tmp_path / "tracked_apps.yml", tmp_path / "snapshot.json"
+    store = ConfigStore(config_path, snapshot_path)
+    config = {"apps": {"owner/app": {"patterns": {"64bit": "x64.zip"}, "last_checked": "2025-01-01T00:00:00Z"}}}
+    store.save(config)
+
+    assert json.loads(snapshot_path.read_text())["config"] == config
+    assert ConfigStore(config_path, snapshot_path).load() == config
+
+
+def test_pickle_snapshot_is_never_unpickled(tmp_path):
+    config_path, snapshot_path = tmp_path / "tracked_apps.yml", tmp_path / "snapshot.json"
+    config_path.write_text("apps: {}\n")
+    snapshot_path.write_bytes(pickle.dumps((None, {"apps": {"evil/app": {}}})))
+    assert ConfigStore(config_path, snapshot_path).load() == {"apps": {}}
@@ -0,0 +1,46 @@
+import pytest
+
+from handlers.generic import GenericHandler, autoupdate_url
+
+
+@pytest.mark.parametrize("url, version, expected", [
+    ("https://github.com/user1/tool1/releases/download/v1/tool1-1-win64.zip", "1",
+     "https://github.com/user1/tool1/releases/download/v$version/tool1-$version-win64.zip"),
+    ("https://github.com/o2/r2/releases/download/2/r2_2_windows_amd64.zip", "2",
+     "https://github.com/o2/r2/releases/download/$version/r2_$version_windows_amd64.zip"),
+    ("https://github.com/o/r/releases/download/v1.10.2/r-1.10.2-x64.zip", "1.10.2",
+     "https://github.com/o/r/releases/download/v$version/r-$version-x64.zip"),
+    ("http://127.0.0.1:8080/assets/o1/r1/r1_1_windows_amd64.zip", "1",
+     "http://127.0.0.1:8080/assets/o1/r1/r1_$version_windows_amd64.zip"),
+])
+def test_autoupdate_url_only_rewrites_tag_and_file_name(url, version, expected):
+    assert autoupdate_url(url, version) == expected
+
+
+def test_generate_with_one_digit_version():
+    url = "https://github.com/user1/app1/releases/download/v1/app1-1-windows-amd64.zip"
+    release = {"assets": [{"name": url.rsplit("/", 1)[1], "browser_download_url": url}]}
+    handler = GenericHandler("user1", "app1", "v1", release, patterns={"64bit": "windows-amd64.zip"},
+                             resolve_hash=lambda url, release: "0" * 64)
+    manifest = handler.generate()
+    assert manifest["autoupdate"]["architecture"]["64bit"]["url"] == \
+        "https://github.com/user1/app1/releases/download/v$version/app1-$version-windows-amd64.zip"
+
+
+def release_with(*names):
+    return {"assets": [{"name": name, "browser_download_url": f"https://github.com/o/app/releases/download/v1.0/{name}"}
+                       for name in names]}
+
+
+def test_overlapping_patterns_prefer_the_most_specific():
+    release = release_with("app-windows-arm64.zip", "app-windows-x64.zip")
+    handler = GenericHandler("o", "app", "v1.0", release, patterns={"64bit": "windows", "arm64": "windows-arm64"})
+    matched = handler.match_assets()
+    assert matched["64bit"]["name"] == "app-windows-x64.zip"
+    assert matched["arm64"]["name"] == "app-windows-arm64.zip"
+
+
+def test_checksum_and_signature_assets_are_skipped():
+    release = release_with("app-win64.zip.sha256", "app-win64.zip.asc", "app-win64.zip", "SHA256SUMS")
+    handler = GenericHandler("o", "app", "v1.0", release, patterns={"64bit": "win64.zip"})
+    assert handler.match_assets()["64bit"]["name"] == "app-win64.zip"
@@ -0,0 +1,58 @@
+import hashlib
+import json
+
+import requests
+
+from github_graphql import fetch_latest_releases
+from http_session import PooledSession
+from treble_scoop_updater import TrebleScoopUpdater
+
+
+def test_graphql_maps_to_rest_release(standin):
+    with requests.Session() as session:
+        results = fetch_latest_releases(f"{standin.url}/graphql", {}, ["o/app", "o/tool"], session=session)
+    rest = standin.release("o", "app")
+
+    assert set(results) == {"o/app", "o/tool"}
+    assert results["o/app"]["license"] == "MIT"
+    release = results["o/app"]["release"]
+    assert release["tag_name"] == rest["tag_name"]
+    assert release["published_at"] == rest["published_at"]
+    assert release["body"] == rest["body"]
+    assert [{key: asset[key] for key in ("name", "size", "updated_at", "browser_download_url")}
+            for asset in release["assets"]] == rest["assets"]
+
+
+def test_graphql_batches_requests(standin):
+    repos = [f"o/app{i}" for i in range(5)]
+    with requests.Session() as session:
+        results = fetch_latest_releases(f"{standin.url}/graphql", {}, repos, batch_size=2, session=session)
+    assert list(results) == repos
+    assert standin.stats["requests"] == 3
+
+
+def test_graphql_run_matches_rest_run(standin, bucket_repo):
+    repo_path = bucket_repo("owner/app")
+    manifest_path = repo_path / "bucket" / "app.json"
+    TrebleScoopUpdater(repo_path, "token", api_url=standin.url, session=PooledSession()).update_manifests(
+        check_all=True, commit=False)
+    rest_manifest = json.loads(manifest_path.read_text())
+
+    manifest_path.unlink()
+    TrebleScoopUpdater(repo_path, "token", api_url=standin.url, session=PooledSession()).update_manifests(
+        check_all=True, commit=False, graphql=True)
+    assert json.loads(manifest_path.read_text()) == rest_manifest
+
+
+def test_graphql_digest_skips_downloads_and_is_rate_limited(standin, bucket_repo):
+    standin.asset_digests = True
+    repo_path = bucket_repo("owner/app")
+    updater = TrebleScoopUpdater(repo_path, "token", api_url=standin.url, session=PooledSession())
+    updater.update_manifests(check_all=True, commit=False, graphql=True)
+
+    manifest = json.loads((repo_path / "bucket" / "app.json").read_text())
+    assert manifest["architecture"]["64bit"]["hash"] == hashlib.sha256(standin.asset).hexdigest()
+    assert standin.stats["asset_downloads"] == 0
+    # The batch went through the updater's accounting, on the GraphQL quota only.
+    assert updater.metrics.report()["apps"]["_run"]["counters"]["api_requests"] == 1
+    assert updater.graphql_limiter.remaining == 4990
@@ -0,0 +1,69 @@
+import json
+import os
+import sys
+
+import pytest
+
+from handlers import HandlerRegistry
+
+HANDLER = """from handlers import BaseHandler
+
+
+class {name}(BaseHandler):
+    repos = {repos!r}
+"""
+
+
+@pytest.fixture
+def package(tmp_path, monkeypatch):
+    root = tmp_path / "plugins"
+    (root / "fake_handlers").mkdir(parents=True)
+    (root / "fake_handlers" / "__init__.py").write_text("")
+    monkeypatch.syspath_prepend(str(root))
+    yield root / "fake_handlers"
+    for name in [name for name in sys.modules if name.startswith("fake_handlers")]:
+        del sys.modules[name]
+
+
+def write_handler(path, name, repos):
+    path.write_text(HANDLER.format(name=name, repos=repos))
+
+
+def test_handler_module_is_imported_only_when_used(package, tmp_path):
+    write_handler(package / "alpha.py", "AlphaHandler", ("alpha",))
+    # Importing this module would fail, so the index scan must never execute it.
+    (package / "broken.py").write_text("raise RuntimeError('imported')\n\nclass BrokenHandler(BaseHandler):\n    repos = ('broken',)\n")
+    registry = HandlerRegistry(tmp_path / "index.json", package="fake_handlers")
+
+    assert registry.get("unknown") is None
+    assert "fake_handlers.alpha" not in sys.modules
+    assert registry.get("Alpha").__name__ == "AlphaHandler"
+    assert "fake_handlers.alpha" in sys.modules
+    assert "fake_handlers.broken" not in sys.modules
+    index = json.loads((tmp_path / "index.json").read_text())
+    assert index["broken"]["repos"] == {"broken": "BrokenHandler"}
+
+
+def test_index_is_rebuilt_when_a_handler_changes(package, tmp_path):
+    index_path = tmp_path / "index.json"
+    path = package / "alpha.py"
+    write_handler(path, "AlphaHandler", ("alpha",))
+    HandlerRegistry(index_path, package="fake_handlers").get("alpha")
+    stat = path.stat()
+
+    write_handler(path, "AlphaHandler", ("alpha", "alpha-nightly"))
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    write_handler(package / "beta.py", "BetaHandler", ("beta",))
+    registry = HandlerRegistry(index_path, package="fake_handlers")
+    assert registry.get("alpha-nightly").__name__ == "AlphaHandler"
+    assert registry.get("beta").__name__ == "BetaHandler"
+
+    (package / "beta.py").unlink()
+    assert HandlerRegistry(index_path, package="fake_handlers").get("beta") is None
+    assert set(json.loads(index_path.read_text())) == {"alpha"}
+
+
+def test_bundled_handlers_are_indexed(tmp_path):
+    registry = HandlerRegistry(tmp_path / "index.json")
+    assert registry.get("dive").__name__ == "DiveHandler"
+    assert registry.get("not-a-handler") is None
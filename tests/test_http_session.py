@@ -0,0 +1,57 @@
+import time
+
+import pytest
+from urllib3.exceptions import ReadTimeoutError
+
+from hashing import hash_stream
+from http_session import CircuitBreaker, CircuitOpenError, PooledSession
+
+
+def test_5xx_is_retried(standin):
+    standin.fail_next(2, 503)
+    session = PooledSession(backoff_factor=0)
+    assert session.get(f"{standin.url}/repos/o/r").status_code == 200
+    assert standin.stats["requests"] == 3
+
+
+def test_retry_after_is_honoured(standin):
+    # GitHub's secondary rate limit: a 403 with Retry-After.
+    standin.fail_next(1, 403, {"Retry-After": "1"})
+    session = PooledSession(backoff_factor=0)
+    started = time.monotonic()
+    assert session.get(f"{standin.url}/repos/o/r").status_code == 200
+    assert time.monotonic() - started >= 0.9
+    assert standin.stats["requests"] == 2
+
+
+def test_breaker_trips_then_recovers(standin):
+    session = PooledSession(retries=0, breaker=CircuitBreaker(failure_threshold=2, reset_after=0.2))
+    url = f"{standin.url}/repos/o/r"
+    standin.fail_next(2, 500)
+    assert [session.get(url).status_code for _ in range(2)] == [500, 500]
+    with pytest.raises(CircuitOpenError):
+        session.get(url)
+    assert standin.stats["requests"] == 2
+
+    # Half-open: one failure re-opens the circuit straight away.
+    time.sleep(0.25)
+    standin.fail_next(1, 500)
+    assert session.get(url).status_code == 500
+    with pytest.raises(CircuitOpenError):
+        session.get(url)
+
+    time.sleep(0.25)
+    assert session.get(url).status_code == 200
+    assert session.get(url).status_code == 200
+
+
+def test_streamed_body_timeout_reaches_breaker(standin):
+    standin.body_stall = 1.0
+    session = PooledSession(timeout=(5, 0.2), retries=0, breaker=CircuitBreaker(failure_threshold=1))
+    url = f"{standin.url}/assets/o/r/app.zip"
+    with session.get(url, stream=True) as resp:
+        assert resp.status_code == 200
+        with pytest.raises(ReadTimeoutError):
+            hash_stream(resp.raw)
+    with pytest.raises(CircuitOpenError):
+        session.get(url)
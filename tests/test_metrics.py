@@ -0,0 +1,57 @@
+import json
+import re
+
+from http_session import PooledSession
+from treble_scoop_updater import TrebleScoopUpdater
+
+SAMPLE = re.compile(r'^(?P<name>[a-z_]+)(?:\{(?P<labels>[a-z]+="[^"]*"(?:,[a-z]+="[^"]*")*)\})? (?P<value>[0-9.e+-]+)$')
+
+
+def run(standin, bucket_repo):
+    repo_path = bucket_repo("owner/app", "owner/tool")
+    updater = TrebleScoopUpdater(repo_path, "token", api_url=standin.url, session=PooledSession())
+    updater.update_manifests(check_all=True, commit=False)
+    updater.metrics.write_json(repo_path / "metrics.json")
+    updater.metrics.write_prometheus(repo_path / "metrics.prom")
+    return repo_path
+
+
+def test_json_report_after_standin_run(standin, bucket_repo):
+    report = json.loads((run(standin, bucket_repo) / "metrics.json").read_text())
+
+    assert set(report["apps"]) == {"_run", "owner/app", "owner/tool"}
+    app = report["apps"]["owner/app"]
+    assert {"total", "latest_release", "generate", "hash", "license"} <= set(app["phases"])
+    assert app["phases"]["total"]["calls"] == 1
+    assert app["counters"]["api_requests"] >= 2
+    assert app["counters"]["bytes_downloaded"] == len(standin.asset)
+    assert {"config_io", "index"} <= set(report["apps"]["_run"]["phases"])
+    assert report["totals"]["counters"]["bytes_downloaded"] == 2 * len(standin.asset)
+    assert sorted(entry["app"] for entry in report["slowest_apps"]) == ["owner/app", "owner/tool"]
+
+
+def test_prometheus_textfile_format(standin, bucket_repo):
+    text = (run(standin, bucket_repo) / "metrics.prom").read_text()
+    assert text.endswith("\n")
+
+    declared, samples = {}, []
+    for line in text.splitlines():
+        if line.startswith("# HELP "):
+            declared.setdefault(line.split()[2], set()).add("help")
+        elif line.startswith("# TYPE "):
+            _, _, name, kind = line.split()
+            assert kind == "gauge"
+            assert "help" in declared[name]
+            declared[name].add("type")
+        else:
+            match = SAMPLE.match(line)
+            assert match, line
+            # Every sample follows its own HELP and TYPE lines.
+            assert declared.get(match.group("name")) == {"help", "type"}
+            samples.append(match)
+
+    assert set(declared) == {"treblescoop_run_seconds", "treblescoop_run_timestamp_seconds",
+                             "treblescoop_phase_seconds", "treblescoop_phase_calls", "treblescoop_events"}
+    labels = {(m.group("name"), m.group("labels")) for m in samples}
+    assert ("treblescoop_phase_calls", 'app="owner/app",phase="total"') in labels
+    assert ("treblescoop_events", 'app="owner/tool",event="bytes_downloaded"') in labels
@@ -0,0 +1,58 @@
+import hashlib
+
+import pytest
+
+from http_session import PooledSession
+from treble_scoop_updater import TrebleScoopUpdater
+
+
+@pytest.fixture
+def updater(standin, bucket_repo):
+    return TrebleScoopUpdater(bucket_repo(), "", api_url=standin.url, session=PooledSession())
+
+
+def release(standin, *files, digest=None):
+    asset = {"name": "app.zip", "size": len(standin.asset), "updated_at": "2025-01-01T00:00:00Z",
+             "browser_download_url": f"{standin.url}/assets/o/app/app.zip"}
+    if digest:
+        asset["digest"] = digest
+    return {"assets": [asset] + [{"name": name, "browser_download_url": f"{standin.url}/files/{name}"}
+                                 for name in files]}
+
+
+def actual(standin):
+    return hashlib.sha256(standin.asset).hexdigest()
+
+
+def test_asset_digest_skips_download(standin, updater):
+    digest = "AB" * 32
+    rel = release(standin, digest=f"sha256:{digest}")
+    assert updater._resolve_hash(rel["assets"][0]["browser_download_url"], rel) == digest.lower()
+    assert standin.stats["requests"] == 0
+
+
+@pytest.mark.parametrize("name, line", [
+    ("app.zip.sha256", "{hash}  app.zip"),
+    ("app.zip.sha256", "{hash}"),
+    ("SHA256SUMS", "{other}  other.zip\n{hash} *app.zip"),
+])
+def test_checksum_file_skips_download(standin, updater, name, line):
+    standin.files[name] = line.format(hash=actual(standin), other="1" * 64).encode()
+    rel = release(standin, name)
+    assert updater._resolve_hash(rel["assets"][0]["browser_download_url"], rel) == actual(standin)
+    assert standin.stats["asset_downloads"] == 0
+
+
+@pytest.mark.parametrize("files, digest", [
+    ({"SHA256SUMS": "{other}  other.zip\n"}, None),
+    ({"other.zip.sha256": "{other}  other.zip\n"}, None),
+    ({}, "sha512:" + "2" * 128),
+    ({"SHA256SUMS": None}, None),
+])
+def test_missing_or_mismatched_checksum_downloads(standin, updater, files, digest):
+    for name, text in files.items():
+        if text is not None:
+            standin.files[name] = text.format(other="1" * 64).encode()
+    rel = release(standin, *files, digest=digest)
+    assert updater._resolve_hash(rel["assets"][0]["browser_download_url"], rel) == actual(standin)
+    assert standin.stats["asset_downloads"] == 1
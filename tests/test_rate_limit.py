@@ -0,0 +1,96 @@
+import time
+
+import pytest
+
+import rate_limit
+from http_session import PooledSession
+from rate_limit import RateLimiter, RateLimitExceeded
+from treble_scoop_updater import TrebleScoopUpdater
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+        self.waits = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.waits.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limit.time, "time", fake.time)
+    monkeypatch.setattr(rate_limit.time, "sleep", fake.sleep)
+    return fake
+
+
+def test_paced_calls_within_budget_never_refuse(clock):
+    limiter = RateLimiter()
+    limiter.update_from_status(150, clock.now + 3600)
+    for _ in range(150 - limiter.reserve):
+        limiter.acquire()
+    assert max(clock.waits) <= limiter.max_wait
+
+
+def test_concurrent_burst_waits_at_most_max_wait(clock):
+    limiter = RateLimiter()
+    limiter.update_from_status(150, clock.now + 3600)
+    # Without advancing the clock, as if many workers asked at once.
+    real_sleep, clock.sleep = clock.sleep, clock.waits.append
+    for _ in range(20):
+        limiter.acquire()
+    clock.sleep = real_sleep
+    assert clock.waits and max(clock.waits) <= limiter.max_wait
+
+
+def test_refusal_takes_no_slot_or_quota(clock):
+    limiter = RateLimiter()
+    limiter.update_from_status(limiter.reserve, clock.now + 3600)
+    next_slot = limiter._next_slot
+    for _ in range(3):
+        with pytest.raises(RateLimitExceeded, match="resets in 3600s"):
+            limiter.acquire()
+    assert limiter.remaining == limiter.reserve
+    assert limiter._next_slot == next_slot
+
+
+def test_exhausted_quota_waits_for_a_close_reset(clock):
+    limiter = RateLimiter()
+    limiter.update_from_status(limiter.reserve, clock.now + 30)
+    limiter.acquire()
+    assert clock.waits == [30]
+
+
+def test_scheduler_defers_apps_beyond_budget(bucket_repo):
+    updater = TrebleScoopUpdater(bucket_repo(), "token")
+    updater.rate_limiter.update_from_status(30, 2**40)
+    apps = [(f"owner/app{i}", {"last_checked": None}) for i in range(10)]
+    assert len(updater._schedule_apps(apps, calls_per_app=3)) == 3
+
+
+def test_license_lookup_propagates_rate_limit_refusal(bucket_repo):
+    updater = TrebleScoopUpdater(bucket_repo(), "token", api_url="http://127.0.0.1:9")
+    updater.rate_limiter.update_from_status(0, 2**40)
+    with pytest.raises(RateLimitExceeded):
+        updater._get_repo_license("owner", "app")
+
+
+def test_permission_denial_is_not_reported_as_rate_limiting(standin, bucket_repo, capsys):
+    updater = TrebleScoopUpdater(bucket_repo(), "token", api_url=standin.url, session=PooledSession())
+    standin.fail_next(1, 403, {"X-RateLimit-Remaining": "4999"})
+    assert updater._api_get(f"{standin.url}/repos/o/r") is None
+    out = capsys.readouterr().out
+    assert "failed with status 403: stand-in fault" in out
+    assert "Rate limited" not in out
+
+
+def test_exhausted_quota_is_reported_as_rate_limiting(standin, bucket_repo, capsys):
+    updater = TrebleScoopUpdater(bucket_repo(), "token", api_url=standin.url, session=PooledSession())
+    standin.fail_next(1, 403, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(int(time.time()) + 60)})
+    assert updater._api_get(f"{standin.url}/repos/o/r") is None
+    assert "Rate limited" in capsys.readouterr().out
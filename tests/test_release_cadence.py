@@ -0,0 +1,70 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import yaml
+
+from http_session import PooledSession
+from release_cadence import (MAX_INTERVAL_HOURS, MIN_INTERVAL_HOURS, format_timestamp, is_due, learn_cadence,
+                             poll_interval_hours, schedule_next_check)
+from treble_scoop_updater import TrebleScoopUpdater
+
+NOW = datetime(2025, 6, 1, tzinfo=timezone.utc)
+
+
+def releases_every(hours, count, **extra):
+    return [{"published_at": format_timestamp(NOW - timedelta(hours=hours * i)), **extra} for i in range(count)]
+
+
+@pytest.mark.parametrize("releases, median", [
+    (releases_every(24, 5), 24),
+    (releases_every(24 * 90, 4), 24 * 90),
+    # Out-of-order input and one burst of hotfixes: the median ignores the outlier.
+    (releases_every(240, 5)[::-1] + [{"published_at": format_timestamp(NOW - timedelta(hours=1))}], 240),
+])
+def test_learn_cadence_from_history(releases, median):
+    assert learn_cadence(releases)["median_interval_hours"] == median
+
+
+def test_learn_cadence_skips_drafts_prereleases_and_short_histories():
+    assert learn_cadence(releases_every(24, 1)) is None
+    assert learn_cadence(releases_every(24, 3, prerelease=True)) is None
+    assert learn_cadence(releases_every(24, 3, draft=True) + releases_every(48, 1)) is None
+
+
+@pytest.mark.parametrize("median, expected", [
+    (None, MIN_INTERVAL_HOURS),
+    (2, MIN_INTERVAL_HOURS),
+    (96, 24),
+    (24 * 365, MAX_INTERVAL_HOURS),
+])
+def test_poll_interval_is_clamped(median, expected):
+    cadence = {"median_interval_hours": median} if median is not None else None
+    assert poll_interval_hours(cadence) == expected
+
+
+def test_is_due():
+    assert is_due({}, NOW)
+    assert is_due({"cadence": {"median_interval_hours": 24}}, NOW)
+    assert is_due({"cadence": {"next_check": schedule_next_check(None, NOW - timedelta(hours=5))}}, NOW)
+    assert not is_due({"cadence": {"next_check": schedule_next_check({"median_interval_hours": 96}, NOW)}}, NOW)
+
+
+def test_update_skips_apps_that_are_not_due(standin, bucket_repo):
+    repo_path = bucket_repo("owner/new", "owner/slow")
+    config_path = repo_path / "scripts" / "tracked_apps.yml"
+    config = yaml.safe_load(config_path.read_text())
+    next_check = format_timestamp(datetime.now(timezone.utc) + timedelta(days=3))
+    config["apps"]["owner/slow"]["cadence"] = {"median_interval_hours": 24 * 30, "next_check": next_check}
+    config_path.write_text(yaml.dump(config))
+
+    updater = TrebleScoopUpdater(repo_path, "token", api_url=standin.url, session=PooledSession())
+    updater.update_manifests(commit=False)
+    assert (repo_path / "bucket" / "new.json").exists()
+    assert not (repo_path / "bucket" / "slow.json").exists()
+
+    updater.update_manifests(commit=False, check_all=True)
+    assert (repo_path / "bucket" / "slow.json").exists()
+    # A new app learns its cadence and gets a next check within the interval cap.
+    scheduled = yaml.safe_load(config_path.read_text())["apps"]["owner/new"]["cadence"]["next_check"]
+    assert datetime.now(timezone.utc) < datetime.fromisoformat(scheduled.replace("Z", "+00:00")) <= \
+        datetime.now(timezone.utc) + timedelta(hours=MAX_INTERVAL_HOURS)
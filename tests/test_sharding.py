@@ -0,0 +1,92 @@
+import json
+import shutil
+
+import pytest
+import yaml
+
+from http_session import PooledSession
+from sharding import parse_shard, shard_of
+from treble_scoop_updater import TrebleScoopUpdater
+
+APPS = [f"owner/app{i}" for i in range(9)]
+
+
+def test_shard_assignment_is_stable():
+    # Fixed values: a salted hash() would change these from one process to the next.
+    assert [shard_of(app, 3) for app in APPS] == [0, 1, 2, 1, 0, 0, 2, 2, 1]
+    assert shard_of("Owner/App0", 3) == shard_of("owner/app0", 3)
+
+
+@pytest.mark.parametrize("value", ["3/3", "-1/2", "0/0", "1"])
+def test_parse_shard_rejects_bad_values(value):
+    with pytest.raises(ValueError):
+        parse_shard(value)
+
+
+def run_shards(standin, repo_path, count):
+    outputs = []
+    for index in range(count):
+        output = repo_path / "shards" / str(index)
+        TrebleScoopUpdater(repo_path, "token", api_url=standin.url, session=PooledSession()).update_manifests(
+            check_all=True, commit=False, shard=(index, count), shard_output=output)
+        outputs.append(output)
+    return outputs
+
+
+def fresh_repo(repo_path, name):
+    target = repo_path / name
+    (target / "bucket").mkdir(parents=True)
+    (target / "scripts").mkdir()
+    shutil.copyfile(repo_path / "scripts" / "tracked_apps.yml", target / "scripts" / "tracked_apps.yml")
+    return target
+
+
+def merge(repo_path, outputs):
+    TrebleScoopUpdater(repo_path, "token").merge_shards(outputs, commit=False)
+    config = yaml.safe_load((repo_path / "scripts" / "tracked_apps.yml").read_text())
+    manifests = {path.name: path.read_text() for path in (repo_path / "bucket").glob("*.json")}
+    return manifests, config
+
+
+def test_shards_cover_every_app_once_and_merge_in_any_order(standin, bucket_repo):
+    repo_path = bucket_repo(*APPS)
+    pristine = repo_path / "scripts" / "tracked_apps.yml"
+    original = pristine.read_text()
+    outputs = run_shards(standin, repo_path, 3)
+    pristine.write_text(original)
+
+    deltas = [json.loads((output / "config_delta.json").read_text()) for output in outputs]
+    assert sorted(app for delta in deltas for app in delta) == sorted(APPS)
+    assert sum(len(list((output / "bucket").glob("*.json"))) for output in outputs) == len(APPS)
+
+    forward = merge(fresh_repo(repo_path, "forward"), outputs)
+    backward = merge(fresh_repo(repo_path, "backward"), outputs[::-1])
+    assert forward == backward
+    assert len(forward[0]) == len(APPS)
+    assert all(info["last_checked"] == "2025-01-01T00:00:00Z" for info in forward[1]["apps"].values())
+
+
+def test_overlapping_shards_are_refused_before_writing(standin, bucket_repo):
+    repo_path = bucket_repo(*APPS)
+    outputs = run_shards(standin, repo_path, 2)
+    stale = repo_path / "shards" / "stale"
+    shutil.copytree(outputs[0], stale)
+
+    target = fresh_repo(repo_path, "target")
+    with pytest.raises(ValueError, match="is in both"):
+        TrebleScoopUpdater(target, "token").merge_shards([*outputs, stale], commit=False)
+    assert not list((target / "bucket").glob("*.json"))
+
+
+def test_invalid_shard_manifest_is_not_merged(standin, bucket_repo):
+    repo_path = bucket_repo("owner/app0")
+    pristine = repo_path / "scripts" / "tracked_apps.yml"
+    original = pristine.read_text()
+    [output] = run_shards(standin, repo_path, 1)
+    pristine.write_text(original)
+    (output / "bucket" / "app0.json").write_text(json.dumps({"homepage": "https://example.com"}))
+
+    target = fresh_repo(repo_path, "target")
+    manifests, config = merge(target, [output])
+    assert manifests == {}
+    assert config["apps"]["owner/app0"]["last_checked"] is None
@@ -0,0 +1,37 @@
+import hashlib
+import json
+
+from github_standin import _build_zip
+from http_session import PooledSession
+from treble_scoop_updater import TrebleScoopUpdater
+
+
+def test_update_against_standin(standin, bucket_repo):
+    repo_path = bucket_repo("owner/app")
+    updater = TrebleScoopUpdater(repo_path, "token", api_url=standin.url, session=PooledSession())
+    updater.update_manifests(check_all=True, commit=False)
+
+    manifest = json.loads((repo_path / "bucket" / "app.json").read_text())
+    assert manifest["version"] == "1.0.0"
+    assert manifest["license"] == "MIT"
+    assert manifest["extract_dir"] == "app"
+    assert manifest["autoupdate"]["architecture"]["64bit"]["url"].endswith("/app_$version_windows_amd64.zip")
+
+    standin.reset_stats()
+    updater.update_manifests(check_all=True, commit=False)
+    assert standin.stats["asset_downloads"] == 0
+
+
+def test_file_hash_probe_survives_rejected_head(standin, bucket_repo):
+    standin.head_status = 403
+    updater = TrebleScoopUpdater(bucket_repo(), "", api_url=standin.url, session=PooledSession())
+    url = f"{standin.url}/assets/o/r/tool.zip"
+
+    assert updater._get_file_hash(url) == hashlib.sha256(standin.asset).hexdigest()
+    assert updater._get_file_hash(url) == hashlib.sha256(standin.asset).hexdigest()
+    assert standin.stats["asset_downloads"] == 1
+
+    # The ranged GET fallback carries the new ETag, so a replaced file is hashed again.
+    standin.asset = _build_zip(80 * 1024)
+    assert updater._get_file_hash(url) == hashlib.sha256(standin.asset).hexdigest()
+    assert standin.stats["asset_downloads"] == 2
@@ -0,0 +1,32 @@
+from manifest_io import canonical_json
+from validate_manifests import check_file, main
+
+
+def test_missing_final_newline_is_fixed(tmp_path):
+    path = tmp_path / "app.json"
+    manifest = {"version": "1.0", "homepage": "https://example.com"}
+    path.write_text(canonical_json(manifest).rstrip("\n"), encoding="utf-8")
+
+    assert not check_file(path)["formatted"]
+    assert check_file(path, fix=True)["formatted"]
+    assert path.read_text(encoding="utf-8") == canonical_json(manifest)
+    assert check_file(path)["formatted"]
+
+
+def test_crlf_line_endings_are_accepted(tmp_path):
+    path = tmp_path / "app.json"
+    path.write_bytes(canonical_json({"version": "1.0", "homepage": ""}).replace("\n", "\r\n").encode())
+    assert check_file(path)["formatted"]
+
+
+def test_bucket_is_canonical():
+    assert main(["--jobs", "1"]) == 0
+
+
+def test_non_ascii_text_is_kept_verbatim(tmp_path):
+    path = tmp_path / "app.json"
+    text = '{\n    "version": "1.0",\n    "homepage": "",\n    "description": "Zeichenkette für café ✓"\n}\n'
+    path.write_bytes(text.encode("utf-8"))
+    assert check_file(path)["formatted"]
+    assert check_file(path, fix=True)["formatted"]
+    assert path.read_bytes() == text.encode("utf-8")
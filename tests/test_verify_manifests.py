@@ -0,0 +1,80 @@
+import hashlib
+import json
+
+import requests
+
+from artifact_store import ArtifactStore
+from treble_scoop_updater import TrebleScoopUpdater, probe_hash_key
+from verify_manifests import ManifestVerifier
+
+
+def _response(status, headers):
+    resp = requests.Response()
+    resp.status_code = status
+    resp.headers.update(headers)
+    return resp
+
+
+def test_probe_key_takes_size_from_content_range():
+    ranged = _response(206, {"Content-Length": "1", "Content-Range": "bytes 0-0/4096", "ETag": '"e"'})
+    head = _response(200, {"Content-Length": "4096", "ETag": '"e"'})
+    assert probe_hash_key("u", ranged) == probe_hash_key("u", head) == ("u", 4096, "", '"e"')
+
+
+def test_verify_reports_urls_and_hashes(standin, bucket_repo):
+    repo_path = bucket_repo()
+    asset = f"{standin.url}/assets/o/r/app.zip"
+    good = hashlib.sha256(standin.asset).hexdigest()
+    (repo_path / "bucket" / "app.json").write_text(json.dumps({
+        "version": "1",
+        "architecture": {
+            "64bit": {"url": asset + "#/dl.zip", "hash": good},
+            "32bit": {"url": [f"{standin.url}/missing", asset], "hash": ["0" * 64, "sha256:" + "0" * 64]}
+        }
+    }))
+    updater = TrebleScoopUpdater(repo_path, "")
+    report = ManifestVerifier(updater, check_hashes=True).run(sorted((repo_path / "bucket").glob("*.json")), jobs=4)
+
+    results = {(r["architecture"], r["url"]): r for r in report["results"]}
+    assert results[("64bit", asset + "#/dl.zip")]["hash_ok"] is True
+    assert results[("32bit", f"{standin.url}/missing")]["url_ok"] is False
+    assert results[("32bit", asset)]["hash_ok"] is False
+    assert report["failed"] == 2
+
+
+def test_mixed_algorithms_hash_each_url_in_one_pass(standin, bucket_repo):
+    repo_path = bucket_repo()
+    asset = f"{standin.url}/assets/o/r/app.zip"
+    (repo_path / "bucket" / "app.json").write_text(json.dumps({
+        "version": "1",
+        "architecture": {
+            "64bit": {"url": asset, "hash": "sha512:" + hashlib.sha512(standin.asset).hexdigest()},
+            "32bit": {"url": asset, "hash": "md5:" + hashlib.md5(standin.asset).hexdigest()}
+        }
+    }))
+    updater = TrebleScoopUpdater(repo_path, "")
+    report = ManifestVerifier(updater, check_hashes=True).run([repo_path / "bucket" / "app.json"])
+
+    assert [r["hash_ok"] for r in report["results"]] == [True, True]
+    assert standin.stats["asset_downloads"] == 1
+
+
+def test_artifact_store_serves_repeat_verification(standin, bucket_repo, tmp_path):
+    repo_path = bucket_repo()
+    (repo_path / "bucket" / "app.json").write_text(json.dumps({
+        "version": "1",
+        "url": f"{standin.url}/assets/o/r/app.zip",
+        "hash": "md5:" + hashlib.md5(standin.asset).hexdigest()
+    }))
+    paths = [repo_path / "bucket" / "app.json"]
+    for _ in range(2):
+        updater = TrebleScoopUpdater(repo_path, "", artifact_store=ArtifactStore(tmp_path / "store"))
+        report = ManifestVerifier(updater, check_hashes=True).run(paths)
+        assert report["results"][0]["hash_ok"] is True
+    assert standin.stats["asset_downloads"] == 1
+
+
+def test_probe_key_needs_a_successful_response_with_validators():
+    assert probe_hash_key("u", _response(403, {"Content-Length": "512"})) is None
+    assert probe_hash_key("u", _response(200, {})) is None
+    assert probe_hash_key("u", _response(200, {"Last-Modified": "Wed, 01 Jan 2025 00:00:00 GMT"})) is not None
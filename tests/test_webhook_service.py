@@ -0,0 +1,91 @@
+import asyncio
+import json
+import threading
+from pathlib import Path
+
+import pytest
+
+from http_session import PooledSession
+from treble_scoop_updater import TrebleScoopUpdater
+import webhook_replay
+from webhook_service import WebhookService, sign, verify_signature
+
+FIXTURE = Path(__file__).resolve().parent / "fixtures" / "release_published.json"
+SECRET = b"webhook-secret"
+
+
+@pytest.fixture
+def event_loop_thread():
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    yield loop
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+
+
+def test_signature_accepts_only_the_signed_body():
+    body = FIXTURE.read_bytes()
+    signature = sign(SECRET, body)
+    assert verify_signature(SECRET, body, signature)
+    assert not verify_signature(SECRET, body + b" ", signature)
+    assert not verify_signature(b"other-secret", body, signature)
+    assert not verify_signature(SECRET, body, signature.replace("sha256=", "sha1="))
+    assert not verify_signature(SECRET, body, None)
+
+
+def test_replayed_delivery_is_verified_and_applied(standin, bucket_repo, tmp_path, event_loop_thread):
+    repo_path = bucket_repo("owner/app")
+    # Point the recorded asset at the stand-in so the hash can be computed offline.
+    delivery = FIXTURE.read_text().replace(
+        "https://github.com/owner/app/releases/download/v1.2.0/", f"{standin.url}/assets/owner/app/")
+    payload_path = tmp_path / "delivery.json"
+    payload_path.write_text(delivery)
+
+    updater = TrebleScoopUpdater(repo_path, "token", api_url=standin.url, session=PooledSession())
+    service = WebhookService(updater, SECRET, batch_delay=3600, commit=False)
+    server = asyncio.run_coroutine_threadsafe(
+        asyncio.start_server(service._handle_connection, "127.0.0.1", 0), event_loop_thread).result()
+    url = "http://127.0.0.1:%d/" % server.sockets[0].getsockname()[1]
+    try:
+        assert webhook_replay.main([str(payload_path), "--url", url, "--secret", "wrong"]) == 1
+        assert not service._pending
+        assert webhook_replay.main([str(payload_path), "--url", url, "--secret", SECRET.decode()]) == 0
+        assert list(service._pending) == ["owner/app"]
+
+        asyncio.run_coroutine_threadsafe(service.flush(), event_loop_thread).result()
+    finally:
+        event_loop_thread.call_soon_threadsafe(server.close)
+
+    manifest = json.loads((repo_path / "bucket" / "app.json").read_text())
+    assert manifest["version"] == "1.2.0"
+    assert manifest["license"] == "MIT"
+    assert manifest["architecture"]["64bit"]["url"].endswith("/app_1.2.0_windows_amd64.zip")
+
+
+def test_untracked_repository_is_acknowledged(bucket_repo):
+    updater = TrebleScoopUpdater(bucket_repo("owner/app"), "token")
+    payload = json.loads(FIXTURE.read_text())["payload"]
+    payload["repository"]["full_name"] = "someone/else"
+    status, message = WebhookService(updater, SECRET).handle_event("release", payload)
+    assert status == 202
+    assert message.startswith("ignored")
+
+
+def test_each_coalesced_run_has_its_own_metrics(standin, bucket_repo):
+    updater = TrebleScoopUpdater(bucket_repo("owner/app"), "token", api_url=standin.url, session=PooledSession())
+    service = WebhookService(updater, SECRET, commit=False)
+
+    async def two_runs():
+        reports = []
+        for _ in range(2):
+            await service._run(["owner/app"], {})
+            reports.append(service.last_report)
+        return reports
+
+    first, second = asyncio.run(two_runs())
+    assert first["apps"]["owner/app"]["phases"]["total"]["calls"] == 1
+    assert second["apps"]["owner/app"]["phases"]["total"]["calls"] == 1
+    assert "bytes_downloaded" in first["totals"]["counters"]
+    assert "bytes_downloaded" not in second["totals"]["counters"]
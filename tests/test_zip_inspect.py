@@ -0,0 +1,30 @@
+import requests
+
+from github_standin import GitHubStandIn
+from zip_inspect import detect_layout, inspect_zip, list_zip_members
+
+
+def test_layout_detected_from_range_requests(standin):
+    url = f"{standin.url}/assets/o/app/app_1.0.0_windows_amd64.zip"
+    with requests.Session() as session:
+        assert inspect_zip(session, url, "app") == {"extract_dir": "app", "bin": "app.exe"}
+    assert standin.stats["asset_downloads"] == 0
+
+
+def test_large_archive_reads_only_the_tail():
+    standin = GitHubStandIn(asset_size=4 * 1024 * 1024).start()
+    try:
+        url = f"{standin.url}/assets/o/app/app_1.0.0_windows_amd64.zip"
+        with requests.Session() as session:
+            members = list_zip_members(session, url)
+        assert [name for name, _ in members] == ["app/app.exe", "app/README.txt"]
+        assert standin.stats["asset_downloads"] == 0
+        assert standin.stats["bytes_sent"] < 128 * 1024
+    finally:
+        standin.stop()
+
+
+def test_layout_prefers_exe_named_after_app():
+    members = [("tool/helper.exe", 1), ("tool/Tool.exe", 1), ("tool/sub/other.exe", 1)]
+    assert detect_layout(members, "tool") == {"extract_dir": "tool", "bin": "Tool.exe"}
+    assert detect_layout([("a.exe", 1), ("b.exe", 1)], "tool") == {}